@@ -1,28 +1,36 @@
+import sys
+import startup_profile
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    # Start before the GUI imports so they show up in the breakdown
+    startup_profile.start()
+import argparse
 import tkinter as tk
 import customtkinter as ctk
-from datetime import datetime
-import time
-import math
+from clock_face import AnalogFace
+from alarms import AlarmController, create_alarm_engine, parse_alarm_option, parse_duration
+from clock_themes import default_theme, initial_themes, load_themes
+from clock_time import SnapshotClock
+from label_binding import LabelBinder
+from power_saver import PowerSaver, POWER_PROFILES, power_profile
+from tick_profiler import create_profiler
+from tick_scheduler import FramePacer, TickScheduler, ANIMATION_FRAME_INTERVAL
 
 class AdvancedAnalogClock(ctk.CTk):
-    def __init__(self):
+    def __init__(self, clock_size=300, time_source=None, themes=None, power_profile=None, sweep=False, profile_output=None, profile_overlay=False, alarm_engine=None):
         super().__init__()
+        startup_profile.mark("window")
         
         # Window configuration
         self.title("Analog Clock")
         self.geometry("800x600")  # Increased height for better display
         self.resizable(False, False)
         
-        # Modern color scheme
-        self.bg_color = "#121212"
-        self.primary_color = "#4FC3F7"
-        self.secondary_color = "#FF4081"
-        self.text_color = "#E0E0E0"
-        self.accent_color = "#7C4DFF"
+        # Modern color scheme; without a registry (see initial_themes) the theme tables are compiled after the first frame
+        self.themes = themes
+        self.set_theme_colors(themes.current if themes is not None else default_theme())
         
-        # Configure appearance
+        # Configure appearance (customtkinter already loaded its default "blue" theme on import)
         ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("blue")
         self.configure(fg_color=self.bg_color)
         
         # Create main container
@@ -39,7 +47,7 @@ class AdvancedAnalogClock(ctk.CTk):
         self.date_label.pack(pady=(0, 20))
         
         # Analog clock canvas
-        self.clock_size = 300
+        self.clock_size = clock_size
         self.clock_canvas = tk.Canvas(
             self.main_frame,
             width=self.clock_size,
@@ -53,6 +61,7 @@ class AdvancedAnalogClock(ctk.CTk):
         self.center_x = self.clock_size // 2
         self.center_y = self.clock_size // 2
         self.clock_radius = self.clock_size // 2 - 10
+        self.face = AnalogFace(self.clock_canvas, self.clock_size, self.clock_radius)
         
         # AM/PM indicator
         self.ampm_label = ctk.CTkLabel(
@@ -63,9 +72,58 @@ class AdvancedAnalogClock(ctk.CTk):
         )
         self.ampm_label.pack()
         
-        # Additional info (day of week, week number)
-        self.info_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+        # Additional info (day of week, week number); the labels are built after the first frame
+        # in a frame already sized for them, so nothing moves when they appear
+        self.info_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent", height=28)
         self.info_frame.pack(pady=(20, 0))
+        self.day_of_week_label = None
+        
+        # Labels are only reconfigured when their text or color changes
+        self.label_binder = LabelBinder()
+        
+        # Formatted time fields, recomputed only when they change
+        self.snapshot_clock = SnapshotClock(time_source)
+        
+        # Animation variables
+        self.animation_step = 0
+        self.animation_direction = 1
+        self.pulse_slot = None
+        self.shown_second = None
+        self.last_snapshot = None
+        
+        # Build the static face once; ticks only move the hands
+        self.draw_clock_face()
+        
+        # Start the clock, ticking on second (or animation frame) boundaries,
+        # and only once a minute or not at all while the window is hidden
+        self.tick_scheduler = TickScheduler(self, self.update_clock)
+        self.power_saver = PowerSaver(self, self.tick_scheduler, power_profile, resync=self.update_clock)
+        # Sweep mode moves the second hand every frame, at 60 fps or as fast as rendering allows
+        self.sweep = sweep
+        self.frame_pacer = FramePacer(self, self.power_saver) if sweep else None
+        # Alarms ring on ticks, or from one wake-up timer while the window is hidden
+        self.alarms = AlarmController(
+            self, alarm_engine if alarm_engine is not None else create_alarm_engine(),
+            self.power_saver, self.refresh_alarms
+        )
+        self.profiler = create_profiler(self, self.tick_scheduler, profile_output, profile_overlay)
+        self.update_clock()
+        self.tick_scheduler.start()
+        startup_profile.mark("first frame ready")
+        
+        # Configure window to be always on top
+        self.attributes('-topmost', True)
+        self.after(2000, lambda: self.attributes('-topmost', False))
+        
+        # Everything the first frame does not need waits until it is on screen
+        self.context_menu = None
+        startup_profile.after_first_paint(self, self.finish_startup)
+        
+    def finish_startup(self):
+        """Build the secondary info labels, theme tables and context menu after the first paint"""
+        if self.context_menu is not None:
+            return
+        startup_profile.mark("first paint")
         
         self.day_of_week_label = ctk.CTkLabel(
             self.info_frame,
@@ -83,175 +141,98 @@ class AdvancedAnalogClock(ctk.CTk):
         )
         self.week_number_label.pack(side=tk.LEFT, padx=10)
         
-        # Animation variables
-        self.animation_phase = 0
-        self.animation_direction = 1
-        
-        # Start the clock
-        self.update_clock()
+        self.update_info_labels(self.last_snapshot)
         
-        # Configure window to be always on top
-        self.attributes('-topmost', True)
-        self.after(2000, lambda: self.attributes('-topmost', False))
+        if self.themes is None:
+            self.themes = load_themes()
         
         # Add right-click menu
         self.bind("<Button-3>", self.show_context_menu)
         self.context_menu = tk.Menu(self, tearoff=0)
         self.context_menu.add_command(label="Change Theme", command=self.change_theme)
         self.context_menu.add_command(label="Toggle Fullscreen", command=self.toggle_fullscreen)
+        # The alarm submenu is rebuilt from the engine each time it opens
+        alarm_menu = tk.Menu(self.context_menu, tearoff=0)
+        alarm_menu.configure(postcommand=lambda: self.alarms.fill_menu(alarm_menu))
+        self.context_menu.add_cascade(label="Alarms", menu=alarm_menu)
         self.context_menu.add_command(label="Exit", command=self.destroy)
+        startup_profile.mark("startup finished")
+        startup_profile.report()
         
     def draw_clock_face(self):
-        # Clear canvas
-        self.clock_canvas.delete("all")
-        
-        # Draw clock face
-        self.clock_canvas.create_oval(
-            self.center_x - self.clock_radius,
-            self.center_y - self.clock_radius,
-            self.center_x + self.clock_radius,
-            self.center_y + self.clock_radius,
-            outline=self.text_color,
-            width=2
+        """Build the static face and tagged hand items once"""
+        self.face.draw(self.text_color, self.primary_color, self.secondary_color)
+        # The new hand items start at 12:00; place them on the next tick
+        self.shown_second = None
+    
+    def recolor_clock_face(self):
+        """Apply the current colors to the existing canvas items"""
+        # The second hand takes its pulse color now instead of on the next tick
+        self.face.recolor(
+            self.text_color, self.primary_color, self.secondary_color,
+            self.pulse_color()
         )
-        
-        # Draw hour markers
-        for i in range(12):
-            angle = math.radians(i * 30 - 90)
-            inner_x = self.center_x + (self.clock_radius - 20) * math.cos(angle)
-            inner_y = self.center_y + (self.clock_radius - 20) * math.sin(angle)
-            outer_x = self.center_x + self.clock_radius * math.cos(angle)
-            outer_y = self.center_y + self.clock_radius * math.sin(angle)
+    
+    def update_clock(self):
+        self.profiler.begin_tick()
+        if self.frame_pacer is not None:
+            self.frame_pacer.begin_frame()
+        now = self.last_snapshot = self.snapshot_clock.snapshot()
+        self.profiler.mark("strftime")
+        
+        # Labels and the hour and minute hands only change with the second
+        new_second = (now.hour, now.minute, now.second) != self.shown_second
+        if new_second:
+            self.shown_second = (now.hour, now.minute, now.second)
             
-            self.clock_canvas.create_line(
-                inner_x, inner_y,
-                outer_x, outer_y,
-                fill=self.text_color,
-                width=3
+            # Update date and info labels; a ringing alarm takes the date's place
+            # and blinks there and on the bezel until it is dismissed
+            self.alarms.poll()
+            date_text, date_color = self.alarms.banner(now, self.accent_color, self.text_color) or (now.date_text, self.text_color)
+            self.label_binder.update(self.date_label, text=date_text, text_color=date_color)
+            self.face.set_bezel_color(date_color)
+            self.label_binder.update(self.ampm_label, text=now.ampm)
+            if self.day_of_week_label is not None:
+                self.update_info_labels(now)
+        self.profiler.mark("labels")
+        
+        # Move the hands, with the pulse animation on the second hand
+        if new_second:
+            self.face.set_hands(
+                now.hour, now.minute, now.second, self.pulse_color(),
+                now.microsecond if self.sweep else None
             )
-            
-            # Add hour numbers
-            if i == 0:
-                num = 12
-            else:
-                num = i
-                
-            text_x = self.center_x + (self.clock_radius - 40) * math.cos(angle)
-            text_y = self.center_y + (self.clock_radius - 40) * math.sin(angle)
-            
-            self.clock_canvas.create_text(
-                text_x, text_y,
-                text=str(num),
-                fill=self.text_color,
-                font=("Helvetica", 12, "bold")
+        elif self.sweep:
+            self.face.sweep(now.second, now.microsecond, self.pulse_color())
+        else:
+            self.face.set_second_color(self.pulse_color())
+        self.profiler.mark("canvas")
+        
+        # Update animation variables; sweep frames keep the pulse at its usual pace
+        pulse_slot = now.microsecond // int(ANIMATION_FRAME_INTERVAL * 1000000) if self.sweep else None
+        if self.power_saver.pulse and (pulse_slot is None or pulse_slot != self.pulse_slot):
+            self.pulse_slot = pulse_slot
+            self.animation_step, self.animation_direction = self.pulse_palette.advance(
+                self.animation_step, self.animation_direction
             )
-        
-        # Draw minute markers
-        for i in range(60):
-            if i % 5 != 0:  # Skip hour markers
-                angle = math.radians(i * 6 - 90)
-                inner_x = self.center_x + (self.clock_radius - 10) * math.cos(angle)
-                inner_y = self.center_y + (self.clock_radius - 10) * math.sin(angle)
-                outer_x = self.center_x + self.clock_radius * math.cos(angle)
-                outer_y = self.center_y + self.clock_radius * math.sin(angle)
-                
-                self.clock_canvas.create_line(
-                    inner_x, inner_y,
-                    outer_x, outer_y,
-                    fill=self.text_color,
-                    width=1
-                )
+        if self.frame_pacer is not None:
+            self.frame_pacer.end_frame()
+        self.profiler.end_tick()
     
-    def update_clock(self):
-        now = datetime.now()
-        
-        # Get current time
-        hour = now.hour % 12
-        minute = now.minute
-        second = now.second
-        ampm = "AM" if now.hour < 12 else "PM"
-        
-        # Update date and info labels
-        date_str = now.strftime("%A, %B %d, %Y")
-        self.date_label.configure(text=date_str)
-        self.ampm_label.configure(text=ampm)
-        
-        day_of_week = now.strftime("%A")
-        week_number = now.strftime("%U")
-        self.day_of_week_label.configure(text=f"Day: {day_of_week}")
-        self.week_number_label.configure(text=f"Week: {week_number}")
-        
-        # Draw clock face
-        self.draw_clock_face()
-        
-        # Calculate angles for clock hands
-        hour_angle = math.radians((hour * 30) + (minute * 0.5) - 90)
-        minute_angle = math.radians((minute * 6) + (second * 0.1) - 90)
-        second_angle = math.radians(second * 6 - 90)
-        
-        # Draw hour hand
-        hour_length = self.clock_radius * 0.5
-        hour_x = self.center_x + hour_length * math.cos(hour_angle)
-        hour_y = self.center_y + hour_length * math.sin(hour_angle)
-        self.clock_canvas.create_line(
-            self.center_x, self.center_y,
-            hour_x, hour_y,
-            fill=self.primary_color,
-            width=6,
-            capstyle=tk.ROUND
-        )
-        
-        # Draw minute hand
-        minute_length = self.clock_radius * 0.7
-        minute_x = self.center_x + minute_length * math.cos(minute_angle)
-        minute_y = self.center_y + minute_length * math.sin(minute_angle)
-        self.clock_canvas.create_line(
-            self.center_x, self.center_y,
-            minute_x, minute_y,
-            fill=self.primary_color,
-            width=4,
-            capstyle=tk.ROUND
-        )
-        
-        # Draw second hand with animation effect
-        pulse_intensity = 0.5 + (math.sin(self.animation_phase * math.pi) * 0.5)
-        second_color = self.fade_color(self.secondary_color, "#FFFFFF", pulse_intensity)
-        
-        second_length = self.clock_radius * 0.8
-        second_x = self.center_x + second_length * math.cos(second_angle)
-        second_y = self.center_y + second_length * math.sin(second_angle)
-        self.clock_canvas.create_line(
-            self.center_x, self.center_y,
-            second_x, second_y,
-            fill=second_color,
-            width=2,
-            capstyle=tk.ROUND
-        )
-        
-        # Draw center circle
-        self.clock_canvas.create_oval(
-            self.center_x - 8, self.center_y - 8,
-            self.center_x + 8, self.center_y + 8,
-            fill=self.secondary_color,
-            outline=self.secondary_color
-        )
-        
-        # Update animation variables
-        self.animation_phase += 0.1 * self.animation_direction
-        if self.animation_phase > 1 or self.animation_phase < 0:
-            self.animation_direction *= -1
-        
-        # Schedule next update
-        self.after(200, self.update_clock)
+    def pulse_color(self):
+        """Color of the pulsing seconds, or the plain secondary color while the pulse is off"""
+        if self.power_saver.pulse:
+            return self.pulse_palette.color(self.animation_step)
+        return self.secondary_color
+    
+    def update_info_labels(self, now):
+        self.label_binder.update(self.day_of_week_label, text=f"Day: {now.day_of_week}")
+        self.label_binder.update(self.week_number_label, text=f"Week: {now.week_number}")
     
-    def fade_color(self, color1, color2, ratio):
-        """Blend between two hex colors"""
-        r1, g1, b1 = int(color1[1:3], 16), int(color1[3:5], 16), int(color1[5:7], 16)
-        r2, g2, b2 = int(color2[1:3], 16), int(color2[3:5], 16), int(color2[5:7], 16)
-        r = int(r1 + (r2 - r1) * ratio)
-        g = int(g1 + (g2 - g1) * ratio)
-        b = int(b1 + (b2 - b1) * ratio)
-        return f"#{r:02x}{g:02x}{b:02x}"
+    def refresh_alarms(self):
+        # Show a ringing or dismissed alarm now rather than on the next second
+        self.shown_second = None
+        self.update_clock()
     
     def show_context_menu(self, event):
         try:
@@ -259,41 +240,67 @@ class AdvancedAnalogClock(ctk.CTk):
         finally:
             self.context_menu.grab_release()
     
+    def set_theme_colors(self, theme):
+        self.theme = theme
+        self.bg_color = theme.bg
+        self.primary_color = theme.primary
+        self.secondary_color = theme.secondary
+        self.text_color = theme.text
+        self.accent_color = theme.accent
+        self.pulse_palette = theme.pulse
+    
     def change_theme(self):
-        # Cycle through different color themes
-        themes = [
-            {"bg": "#121212", "primary": "#4FC3F7", "secondary": "#FF4081", "text": "#E0E0E0", "accent": "#7C4DFF"},
-            {"bg": "#0A0A0A", "primary": "#00BCD4", "secondary": "#FF5252", "text": "#F5F5F5", "accent": "#E040FB"},
-            {"bg": "#1A1A1A", "primary": "#18FFFF", "secondary": "#FF6E40", "text": "#FFFFFF", "accent": "#B388FF"},
-            {"bg": "#212121", "primary": "#64FFDA", "secondary": "#FF1744", "text": "#EEEEEE", "accent": "#651FFF"}
-        ]
-        
-        current_theme = {
-            "bg": self.bg_color,
-            "primary": self.primary_color,
-            "secondary": self.secondary_color,
-            "text": self.text_color,
-            "accent": self.accent_color
-        }
-        
-        next_theme = themes[(themes.index(current_theme) + 1) % len(themes)] if current_theme in themes else themes[0]
-        
-        self.bg_color = next_theme["bg"]
-        self.primary_color = next_theme["primary"]
-        self.secondary_color = next_theme["secondary"]
-        self.text_color = next_theme["text"]
-        self.accent_color = next_theme["accent"]
-        
+        # Cycle through the compiled themes
+        self.apply_theme(self.themes.next())
+    
+    def apply_theme(self, theme):
+        """Recolor every widget once, in one pass, including the hands"""
+        self.set_theme_colors(theme)
         self.configure(fg_color=self.bg_color)
         self.clock_canvas.configure(bg=self.bg_color)
-        self.date_label.configure(text_color=self.text_color)
-        self.ampm_label.configure(text_color=self.accent_color)
-        self.day_of_week_label.configure(text_color=self.text_color)
-        self.week_number_label.configure(text_color=self.text_color)
+        self.recolor_clock_face()
+        self.label_binder.update(self.date_label, text_color=self.text_color)
+        self.label_binder.update(self.ampm_label, text_color=self.accent_color)
+        if self.day_of_week_label is not None:
+            self.label_binder.update(self.day_of_week_label, text_color=self.text_color)
+            self.label_binder.update(self.week_number_label, text_color=self.text_color)
     
     def toggle_fullscreen(self):
         self.attributes("-fullscreen", not self.attributes("-fullscreen"))
 
 if __name__ == "__main__":
-    app = AdvancedAnalogClock()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--themes", metavar="PATH", help="extra themes from a .json or .toml file (or set CLOCK_THEMES)")
+    parser.add_argument("--theme", help="name of the theme to start with")
+    parser.add_argument("--sweep", action="store_true", help="sweep the second hand smoothly at up to 60 fps")
+    parser.add_argument("--power", choices=sorted(POWER_PROFILES), help="power profile; \"low\" turns off the pulse and suspends while hidden (or set CLOCK_POWER)")
+    parser.add_argument("--profile", metavar="PATH", help="write tick timings to a .json or .prom file (or set CLOCK_PROFILE)")
+    parser.add_argument("--profile-overlay", action="store_true", help="show tick timings on screen (or set CLOCK_PROFILE_OVERLAY=1)")
+    parser.add_argument("--alarms", metavar="PATH", help="keep alarms and timers in this append-only file (or set CLOCK_ALARMS)")
+    parser.add_argument("--alarm", action="append", default=[], metavar="WHEN[=LABEL]", help="add an alarm at an ISO time or daily at HH:MM[/mon-fri][@ZONE]; repeatable")
+    parser.add_argument("--timer", action="append", default=[], metavar="DURATION[=LABEL]", help="start a countdown timer, e.g. 90s, 15m or 1h; repeatable")
+    parser.add_argument("--startup-profile", action="store_true", help="print import times and startup milestones to stderr")
+    args = parser.parse_args()
+    
+    # Read and check theme, power and alarm options (and their environment variables) before any window opens
+    try:
+        themes = initial_themes(args.themes, args.theme)
+        profile = power_profile(args.power)
+        alarm_engine = create_alarm_engine(args.alarms)
+        for value in args.alarm:
+            alarm_engine.add(*parse_alarm_option(value))
+        for value in args.timer:
+            duration, _, label = value.partition("=")
+            alarm_engine.add_timer(parse_duration(duration), label)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    
+    app = AdvancedAnalogClock(
+        themes=themes,
+        power_profile=profile,
+        sweep=args.sweep,
+        profile_output=args.profile,
+        profile_overlay=args.profile_overlay,
+        alarm_engine=alarm_engine
+    )
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import argparse
+import tkinter as tk
+import customtkinter as ctk
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from clock_colors import PulsePalette
+from clock_themes import default_theme
+from clock_widgets import AnalogClockWidget, DigitalClockWidget
+from label_binding import LabelBinder
+from tick_scheduler import TickScheduler, ANIMATION_FRAME_INTERVAL, SECOND_INTERVAL
+
+WIDGET_STYLES = {"analog": AnalogClockWidget, "digital": DigitalClockWidget}
+
+
+def parse_zone(spec, default_style):
+    """Parse "Europe/London" or "digital:Europe/London" into (style, tz)"""
+    style, _, name = spec.rpartition(":")
+    style = style or default_style
+    if style not in WIDGET_STYLES:
+        raise ValueError(f"Unknown clock style: {style}")
+    return style, ZoneInfo(name)
+
+
+class ClockDashboard(ctk.CTk):
+    def __init__(self, zones, columns=5, clock_size=160, pulse_animation=False):
+        super().__init__()
+
+        # Window configuration
+        self.title("Clock Dashboard")
+        self.geometry("1200x800")
+
+        # Modern color scheme
+        self.colors = dict(default_theme().colors)
+
+        # Configure appearance
+        ctk.set_appearance_mode("dark")
+        self.configure(fg_color=self.colors["bg"])
+
+        # Scrollable grid of clocks
+        self.main_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
+        self.main_frame.pack(expand=True, fill="both", padx=20, pady=20)
+
+        # All widgets share one label cache and one pulse palette
+        self.label_binder = LabelBinder()
+        self.pulse_palette = PulsePalette(self.colors["secondary"])
+        self.animation_step = 0
+        self.animation_direction = 1
+
+        self.clocks = []
+        for index, (style, tz) in enumerate(zones):
+            if style == "analog":
+                widget = AnalogClockWidget(self.main_frame, tz, self.colors, self.label_binder, clock_size)
+            else:
+                widget = DigitalClockWidget(self.main_frame, tz, self.colors, self.label_binder)
+            widget.grid(row=index // columns, column=index % columns, padx=10, pady=10)
+            self.clocks.append(widget)
+
+        # One shared tick drives every clock
+        self.pulse_animation = pulse_animation
+        self.tick_scheduler = TickScheduler(
+            self,
+            self.update_clocks,
+            frame_interval=ANIMATION_FRAME_INTERVAL if self.pulse_animation else SECOND_INTERVAL
+        )
+        self.update_clocks()
+        self.tick_scheduler.start()
+
+        # Add right-click menu
+        self.bind("<Button-3>", self.show_context_menu)
+        self.context_menu = tk.Menu(self, tearoff=0)
+        self.context_menu.add_command(label="Toggle Fullscreen", command=self.toggle_fullscreen)
+        self.context_menu.add_command(label="Exit", command=self.destroy)
+
+    def update_clocks(self):
+        # Read the time once and fan it out; zones shared by several widgets convert once
+        now = datetime.now(timezone.utc)
+        local_times = {}
+
+        second_color = None
+        if self.pulse_animation:
+            second_color = self.pulse_palette.color(self.animation_step)
+            self.animation_step, self.animation_direction = self.pulse_palette.advance(
+                self.animation_step, self.animation_direction
+            )
+
+        for widget in self.clocks:
+            local = local_times.get(widget.tz)
+            if local is None:
+                local = local_times[widget.tz] = now.astimezone(widget.tz)
+            widget.render(local, second_color)
+
+    def show_context_menu(self, event):
+        try:
+            self.context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.context_menu.grab_release()
+
+    def toggle_fullscreen(self):
+        self.attributes("-fullscreen", not self.attributes("-fullscreen"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show many time zones in one window")
+    parser.add_argument("zones", nargs="+", help='IANA zone names, optionally prefixed with a style, e.g. "digital:Asia/Tokyo"')
+    parser.add_argument("--style", choices=sorted(WIDGET_STYLES), default="analog", help="style for zones without a prefix")
+    parser.add_argument("--columns", type=int, default=5)
+    parser.add_argument("--size", type=int, default=160, help="analog clock size in pixels")
+    parser.add_argument("--pulse", action="store_true", help="animate the second hands (ticks 5x per second)")
+    args = parser.parse_args()
+
+    try:
+        zones = [parse_zone(spec, args.style) for spec in args.zones]
+    except (ValueError, KeyError) as exc:
+        parser.error(f"Invalid zone: {exc}")
+    app = ClockDashboard(zones, columns=args.columns, clock_size=args.size, pulse_animation=args.pulse)
+    app.mainloop()
@@ -0,0 +1,87 @@
+import argparse
+import sys
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+from alarms import parse_duration
+from clock_export import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_FRAMES,
+    ImageSequenceWriter,
+    RawVideoWriter,
+    export_frames,
+    parallel_export,
+    parse_start,
+    render_batches,
+    timestamp_batches,
+)
+from clock_themes import default_theme
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render analog clock frames without a display")
+    parser.add_argument("--start", required=True, help="ISO 8601 start time, e.g. 2024-01-01T00:00:00")
+    parser.add_argument("--duration", type=parse_duration, default=60.0, help='clock time to cover, e.g. "24h"')
+    parser.add_argument("--fps", type=float, default=30.0, help="frames per second of clock time")
+    parser.add_argument("--speed", type=float, default=1.0, help="clock seconds per real second (time-lapse factor)")
+    parser.add_argument("--tz", action="append", help="IANA time zone, repeatable (default: system local time)")
+    parser.add_argument("--all-zones", action="store_true", help="render every known IANA time zone")
+    parser.add_argument("--size", type=int, default=300, help="clock size in pixels")
+    parser.add_argument("--format", choices=("raw", "png", "ppm"), default="raw")
+    parser.add_argument("--output", help='file for raw video ("-" for stdout, the default) or directory for images (required)')
+    parser.add_argument("--subsecond", action="store_true", help="step the second hand between whole seconds")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--progress", type=int, default=0, help="report throughput every N frames")
+    parser.add_argument("--workers", type=int, default=0, help="render in N processes (0: single process)")
+    parser.add_argument("--chunk-frames", type=int, default=DEFAULT_CHUNK_FRAMES, help="frames per worker task")
+    args = parser.parse_args()
+    if args.output is None:
+        if args.format != "raw":
+            parser.error(f"--output DIRECTORY is required with --format {args.format}")
+        args.output = "-"
+
+    # Resolved here so a bad zone is reported now, not from inside a worker
+    for zone in args.tz or []:
+        try:
+            ZoneInfo(zone)
+        except (ZoneInfoNotFoundError, ValueError):
+            parser.error(f"Unknown time zone {zone!r}")
+    zones = sorted(available_timezones()) if args.all_zones else (args.tz or [None])
+    # A naive start is local to the zone when there is exactly one, otherwise UTC
+    if len(zones) > 1:
+        start_tz = ZoneInfo("UTC")
+    else:
+        start_tz = ZoneInfo(zones[0]) if zones[0] else None
+    try:
+        start = parse_start(args.start, start_tz)
+    except ValueError as exc:
+        parser.error(f"--start: {exc}")
+    step = args.speed / args.fps
+    # A plain dict, so it pickles into worker tasks
+    colors = dict(default_theme().colors)
+
+    if args.format == "raw":
+        print(
+            f"ffmpeg -f rawvideo -pix_fmt rgb24 -s {args.size}x{args.size} -r {args.fps:g} -i <output> clock.mp4",
+            file=sys.stderr
+        )
+
+    if args.workers or len(zones) > 1:
+        stats = parallel_export(
+            args.output, start, args.duration, step, colors, args.size, zones, args.format,
+            workers=args.workers or None,
+            chunk_frames=args.chunk_frames,
+            subsecond=args.subsecond,
+            progress=sys.stderr if args.progress else None
+        )
+    else:
+        batches = timestamp_batches(start, args.duration, step, args.batch_size)
+        frames = render_batches(batches, colors, args.size, start_tz, args.subsecond)
+        if args.format == "raw":
+            if args.output == "-":
+                writer = RawVideoWriter(sys.stdout.buffer)
+            else:
+                writer = RawVideoWriter(open(args.output, "wb"), close_stream=True)
+        else:
+            writer = ImageSequenceWriter(args.output, args.format)
+        stats = export_frames(frames, writer, args.progress)
+
+    print(f"{stats.frames} frames in {stats.seconds:.2f}s ({stats.fps:.1f} fps)", file=sys.stderr)
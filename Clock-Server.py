@@ -0,0 +1,31 @@
+import argparse
+import asyncio
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from clock_server import ClockServer, ClockState
+from clock_themes import load_themes
+from clock_time import SystemTime
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream the clock to browsers over WebSocket and Server-Sent Events")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on; 0.0.0.0 serves the whole LAN")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tz", help="IANA time zone (default: system local time)")
+    parser.add_argument("--themes", metavar="PATH", help="extra themes from a .json or .toml file (or set CLOCK_THEMES)")
+    parser.add_argument("--theme", help="name of the theme to serve")
+    args = parser.parse_args()
+
+    try:
+        themes = load_themes(args.themes, args.theme)
+        tz = ZoneInfo(args.tz) if args.tz else None
+    except ZoneInfoNotFoundError:
+        parser.error(f"Unknown time zone {args.tz!r}")
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    state = ClockState(SystemTime(tz), themes)
+    server = ClockServer(state, args.host, args.port)
+    print(f"Serving the clock on http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
@@ -1,28 +1,35 @@
+import sys
+import startup_profile
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    # Start before the GUI imports so they show up in the breakdown
+    startup_profile.start()
+import argparse
 import tkinter as tk
 import customtkinter as ctk
-from datetime import datetime
-import time
-import math
+from alarms import AlarmController, create_alarm_engine, parse_alarm_option, parse_duration
+from clock_themes import default_theme, initial_themes, load_themes
+from clock_time import SnapshotClock
+from label_binding import LabelBinder
+from power_saver import PowerSaver, POWER_PROFILES, power_profile
+from tick_profiler import create_profiler
+from tick_scheduler import TickScheduler
 
 class AdvancedDigitalClock(ctk.CTk):
-    def __init__(self):
+    def __init__(self, time_source=None, display_mode="labels", themes=None, power_profile=None, profile_output=None, profile_overlay=False, alarm_engine=None):
         super().__init__()
+        startup_profile.mark("window")
         
         # Window configuration
         self.title("Digital Clock")
         self.geometry("800x400")
         self.resizable(False, False)
         
-        # Modern color scheme
-        self.bg_color = "#121212"
-        self.primary_color = "#4FC3F7"
-        self.secondary_color = "#FF4081"
-        self.text_color = "#E0E0E0"
-        self.accent_color = "#7C4DFF"
+        # Modern color scheme; without a registry (see initial_themes) the theme tables are compiled after the first frame
+        self.themes = themes
+        self.set_theme_colors(themes.current if themes is not None else default_theme())
         
-        # Configure appearance
+        # Configure appearance (customtkinter already loaded its default "blue" theme on import)
         ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("blue")
         self.configure(fg_color=self.bg_color)
         
         # Create main container
@@ -42,58 +49,114 @@ class AdvancedDigitalClock(ctk.CTk):
         self.time_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         self.time_frame.pack(expand=True)
         
-        self.hour_label = ctk.CTkLabel(
-            self.time_frame,
-            text="",
-            font=("Helvetica", 80, "bold"),
-            text_color=self.primary_color
-        )
-        self.hour_label.pack(side=tk.LEFT)
+        if display_mode == "glyphs":
+            # Digits composed from pre-rendered glyph images on one canvas
+            from glyph_atlas import GlyphAtlas, GlyphDisplay
+            self.cell_display = GlyphDisplay(self.time_frame, GlyphAtlas(self, self.bg_color))
+        elif display_mode == "cells":
+            # Fixed-layout text cells; ticks repaint only the cells that changed
+            from digital_layout import TextCellDisplay
+            self.cell_display = TextCellDisplay(self.time_frame, self.bg_color)
+        else:
+            self.cell_display = None
         
-        self.colon_label = ctk.CTkLabel(
-            self.time_frame,
-            text=":",
-            font=("Helvetica", 80, "bold"),
-            text_color=self.text_color
-        )
-        self.colon_label.pack(side=tk.LEFT, padx=5)
+        if self.cell_display is not None:
+            # Packed once; the steady-state loop never touches geometry management
+            self.cell_display.canvas.pack()
+        else:
+            self.hour_label = ctk.CTkLabel(
+                self.time_frame,
+                text="",
+                font=("Helvetica", 80, "bold"),
+                text_color=self.primary_color
+            )
+            self.hour_label.pack(side=tk.LEFT)
+            
+            self.colon_label = ctk.CTkLabel(
+                self.time_frame,
+                text=":",
+                font=("Helvetica", 80, "bold"),
+                text_color=self.text_color
+            )
+            self.colon_label.pack(side=tk.LEFT, padx=5)
+            
+            self.minute_label = ctk.CTkLabel(
+                self.time_frame,
+                text="",
+                font=("Helvetica", 80, "bold"),
+                text_color=self.primary_color
+            )
+            self.minute_label.pack(side=tk.LEFT)
+            
+            self.second_colon_label = ctk.CTkLabel(
+                self.time_frame,
+                text=":",
+                font=("Helvetica", 80, "bold"),
+                text_color=self.text_color
+            )
+            self.second_colon_label.pack(side=tk.LEFT, padx=5)
+            
+            self.second_label = ctk.CTkLabel(
+                self.time_frame,
+                text="",
+                font=("Helvetica", 80, "bold"),
+                text_color=self.secondary_color
+            )
+            self.second_label.pack(side=tk.LEFT)
+            
+            # AM/PM indicator
+            self.ampm_label = ctk.CTkLabel(
+                self.time_frame,
+                text="",
+                font=("Helvetica", 24),
+                text_color=self.accent_color
+            )
+            self.ampm_label.pack(side=tk.LEFT, padx=10, pady=(0, 15))
+            
+        # Additional info (day of week, week number); the labels are built after the first frame
+        # in a frame already sized for them, so nothing moves when they appear
+        self.info_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent", height=28)
+        self.info_frame.pack(pady=(20, 0))
+        self.day_of_week_label = None
         
-        self.minute_label = ctk.CTkLabel(
-            self.time_frame,
-            text="",
-            font=("Helvetica", 80, "bold"),
-            text_color=self.primary_color
-        )
-        self.minute_label.pack(side=tk.LEFT)
+        # Labels are only reconfigured when their text or color changes
+        self.label_binder = LabelBinder()
         
-        self.second_colon_label = ctk.CTkLabel(
-            self.time_frame,
-            text=":",
-            font=("Helvetica", 80, "bold"),
-            text_color=self.text_color
-        )
-        self.second_colon_label.pack(side=tk.LEFT, padx=5)
+        # Formatted time fields, recomputed only when they change
+        self.snapshot_clock = SnapshotClock(time_source)
         
-        self.second_label = ctk.CTkLabel(
-            self.time_frame,
-            text="",
-            font=("Helvetica", 80, "bold"),
-            text_color=self.secondary_color
+        # Animation variables
+        self.animation_step = 0
+        self.animation_direction = 1
+        self.last_snapshot = None
+        
+        # Start the clock, ticking on second (or animation frame) boundaries,
+        # and only once a minute or not at all while the window is hidden
+        self.tick_scheduler = TickScheduler(self, self.update_clock)
+        self.power_saver = PowerSaver(self, self.tick_scheduler, power_profile, resync=self.update_clock)
+        # Alarms ring on ticks, or from one wake-up timer while the window is hidden
+        self.alarms = AlarmController(
+            self, alarm_engine if alarm_engine is not None else create_alarm_engine(),
+            self.power_saver, self.update_clock
         )
-        self.second_label.pack(side=tk.LEFT)
+        self.profiler = create_profiler(self, self.tick_scheduler, profile_output, profile_overlay)
+        self.update_clock()
+        self.tick_scheduler.start()
+        startup_profile.mark("first frame ready")
         
-        # AM/PM indicator
-        self.ampm_label = ctk.CTkLabel(
-            self.time_frame,
-            text="",
-            font=("Helvetica", 24),
-            text_color=self.accent_color
-        )
-        self.ampm_label.pack(side=tk.LEFT, padx=10, pady=(0, 15))
+        # Configure window to be always on top
+        self.attributes('-topmost', True)
+        self.after(2000, lambda: self.attributes('-topmost', False))
         
-        # Additional info (day of week, week number)
-        self.info_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.info_frame.pack(pady=(20, 0))
+        # Everything the first frame does not need waits until it is on screen
+        self.context_menu = None
+        startup_profile.after_first_paint(self, self.finish_startup)
+        
+    def finish_startup(self):
+        """Build the secondary info labels, theme tables and context menu after the first paint"""
+        if self.context_menu is not None:
+            return
+        startup_profile.mark("first paint")
         
         self.day_of_week_label = ctk.CTkLabel(
             self.info_frame,
@@ -111,81 +174,80 @@ class AdvancedDigitalClock(ctk.CTk):
         )
         self.week_number_label.pack(side=tk.LEFT, padx=10)
         
-        # Animation variables
-        self.animation_phase = 0
-        self.animation_direction = 1
-        
-        # Start the clock
-        self.update_clock()
+        self.update_info_labels(self.last_snapshot)
         
-        # Configure window to be always on top
-        self.attributes('-topmost', True)
-        self.after(2000, lambda: self.attributes('-topmost', False))
+        if self.themes is None:
+            self.themes = load_themes()
         
         # Add right-click menu
         self.bind("<Button-3>", self.show_context_menu)
         self.context_menu = tk.Menu(self, tearoff=0)
         self.context_menu.add_command(label="Change Theme", command=self.change_theme)
         self.context_menu.add_command(label="Toggle Fullscreen", command=self.toggle_fullscreen)
+        # The alarm submenu is rebuilt from the engine each time it opens
+        alarm_menu = tk.Menu(self.context_menu, tearoff=0)
+        alarm_menu.configure(postcommand=lambda: self.alarms.fill_menu(alarm_menu))
+        self.context_menu.add_cascade(label="Alarms", menu=alarm_menu)
         self.context_menu.add_command(label="Exit", command=self.destroy)
+        startup_profile.mark("startup finished")
+        startup_profile.report()
         
     def update_clock(self):
-        now = datetime.now()
+        self.profiler.begin_tick()
+        now = self.last_snapshot = self.snapshot_clock.snapshot()
+        self.profiler.mark("strftime")
         
         # Update time
-        hour = now.strftime("%I")
-        minute = now.strftime("%M")
-        second = now.strftime("%S")
-        ampm = now.strftime("%p")
-        
-        # Remove leading zero from hour if needed
-        if hour.startswith("0"):
-            hour = hour[1:]
+        if self.cell_display is None:
+            self.label_binder.update(self.hour_label, text=now.hour_text)
+            self.label_binder.update(self.minute_label, text=now.minute_text)
+            self.label_binder.update(self.second_label, text=now.second_text)
+            self.label_binder.update(self.ampm_label, text=now.ampm)
         
-        self.hour_label.configure(text=hour)
-        self.minute_label.configure(text=minute)
-        self.second_label.configure(text=second)
-        self.ampm_label.configure(text=ampm)
-        
-        # Update date
-        date_str = now.strftime("%A, %B %d, %Y")
-        self.date_label.configure(text=date_str)
+        # Update date; a ringing alarm takes its place and blinks until it is dismissed
+        self.alarms.poll()
+        date_text, date_color = self.alarms.banner(now, self.accent_color, self.text_color) or (now.date_text, self.text_color)
+        self.label_binder.update(self.date_label, text=date_text, text_color=date_color)
         
         # Update additional info
-        day_of_week = now.strftime("%A")
-        week_number = now.strftime("%U")
-        self.day_of_week_label.configure(text=f"Day: {day_of_week}")
-        self.week_number_label.configure(text=f"Week: {week_number}")
+        if self.day_of_week_label is not None:
+            self.update_info_labels(now)
+        self.profiler.mark("labels")
         
         # Animation effects
-        self.animation_phase += 0.1 * self.animation_direction
-        if self.animation_phase > 1 or self.animation_phase < 0:
-            self.animation_direction *= -1
-        
-        # Pulse effect on seconds
-        pulse_intensity = 0.5 + (math.sin(self.animation_phase * math.pi) * 0.5)
-        pulse_color = self.fade_color(self.secondary_color, "#FFFFFF", pulse_intensity)
-        self.second_label.configure(text_color=pulse_color)
-        
-        # Colon blink effect
-        if int(second) % 2 == 0:
-            self.colon_label.configure(text_color=self.text_color)
-            self.second_colon_label.configure(text_color=self.text_color)
+        if self.power_saver.pulse:
+            self.animation_step, self.animation_direction = self.pulse_palette.advance(
+                self.animation_step, self.animation_direction
+            )
+        self.render_effects(now)
+        self.profiler.mark("effects")
+        self.profiler.end_tick()
+    
+    def render_effects(self, now):
+        # Pulse effect on seconds and colon blink effect
+        pulse_color = self.pulse_color()
+        colon_color = self.text_color if now.second % 2 == 0 else self.bg_color
+        
+        if self.cell_display is not None:
+            # Both effects only repaint the second and colon cells
+            self.cell_display.show(
+                now.hour_text, now.minute_text, now.second_text, now.ampm,
+                self.primary_color, pulse_color, colon_color, self.accent_color
+            )
         else:
-            self.colon_label.configure(text_color=self.bg_color)
-            self.second_colon_label.configure(text_color=self.bg_color)
-        
-        # Schedule next update
-        self.after(200, self.update_clock)
+            self.label_binder.update(self.second_label, text_color=pulse_color)
+            self.label_binder.update(self.colon_label, text_color=colon_color)
+            self.label_binder.update(self.second_colon_label, text_color=colon_color)
     
-    def fade_color(self, color1, color2, ratio):
-        """Blend between two hex colors"""
-        r1, g1, b1 = int(color1[1:3], 16), int(color1[3:5], 16), int(color1[5:7], 16)
-        r2, g2, b2 = int(color2[1:3], 16), int(color2[3:5], 16), int(color2[5:7], 16)
-        r = int(r1 + (r2 - r1) * ratio)
-        g = int(g1 + (g2 - g1) * ratio)
-        b = int(b1 + (b2 - b1) * ratio)
-        return f"#{r:02x}{g:02x}{b:02x}"
+    def pulse_color(self):
+        """Color of the pulsing seconds, or the plain secondary color while the pulse is off"""
+        if self.power_saver.pulse:
+            return self.pulse_palette.color(self.animation_step)
+        return self.secondary_color
+    
+    def update_info_labels(self, now):
+        self.label_binder.update(self.day_of_week_label, text=f"Day: {now.day_of_week}")
+        self.label_binder.update(self.week_number_label, text=f"Week: {now.week_number}")
     
     def show_context_menu(self, event):
         try:
@@ -193,45 +255,73 @@ class AdvancedDigitalClock(ctk.CTk):
         finally:
             self.context_menu.grab_release()
     
+    def set_theme_colors(self, theme):
+        self.theme = theme
+        self.bg_color = theme.bg
+        self.primary_color = theme.primary
+        self.secondary_color = theme.secondary
+        self.text_color = theme.text
+        self.accent_color = theme.accent
+        self.pulse_palette = theme.pulse
+    
     def change_theme(self):
-        # Cycle through different color themes
-        themes = [
-            {"bg": "#121212", "primary": "#4FC3F7", "secondary": "#FF4081", "text": "#E0E0E0", "accent": "#7C4DFF"},
-            {"bg": "#0A0A0A", "primary": "#00BCD4", "secondary": "#FF5252", "text": "#F5F5F5", "accent": "#E040FB"},
-            {"bg": "#1A1A1A", "primary": "#18FFFF", "secondary": "#FF6E40", "text": "#FFFFFF", "accent": "#B388FF"},
-            {"bg": "#212121", "primary": "#64FFDA", "secondary": "#FF1744", "text": "#EEEEEE", "accent": "#651FFF"}
-        ]
-        
-        current_theme = {
-            "bg": self.bg_color,
-            "primary": self.primary_color,
-            "secondary": self.secondary_color,
-            "text": self.text_color,
-            "accent": self.accent_color
-        }
-        
-        next_theme = themes[(themes.index(current_theme) + 1) % len(themes)] if current_theme in themes else themes[0]
-        
-        self.bg_color = next_theme["bg"]
-        self.primary_color = next_theme["primary"]
-        self.secondary_color = next_theme["secondary"]
-        self.text_color = next_theme["text"]
-        self.accent_color = next_theme["accent"]
-        
+        # Cycle through the compiled themes
+        self.apply_theme(self.themes.next())
+    
+    def apply_theme(self, theme):
+        """Recolor every widget once, in one pass"""
+        self.set_theme_colors(theme)
         self.configure(fg_color=self.bg_color)
-        self.date_label.configure(text_color=self.text_color)
-        self.hour_label.configure(text_color=self.primary_color)
-        self.minute_label.configure(text_color=self.primary_color)
-        self.second_label.configure(text_color=self.secondary_color)
-        self.colon_label.configure(text_color=self.text_color)
-        self.second_colon_label.configure(text_color=self.text_color)
-        self.ampm_label.configure(text_color=self.accent_color)
-        self.day_of_week_label.configure(text_color=self.text_color)
-        self.week_number_label.configure(text_color=self.text_color)
+        self.label_binder.update(self.date_label, text_color=self.text_color)
+        if self.cell_display is not None:
+            self.cell_display.set_background(self.bg_color)
+        else:
+            self.label_binder.update(self.hour_label, text_color=self.primary_color)
+            self.label_binder.update(self.minute_label, text_color=self.primary_color)
+            self.label_binder.update(self.ampm_label, text_color=self.accent_color)
+        if self.day_of_week_label is not None:
+            self.label_binder.update(self.day_of_week_label, text_color=self.text_color)
+            self.label_binder.update(self.week_number_label, text_color=self.text_color)
+        if self.last_snapshot is not None:
+            # Seconds, colons and cells take the new colors now, not on the next tick
+            self.render_effects(self.last_snapshot)
     
     def toggle_fullscreen(self):
         self.attributes("-fullscreen", not self.attributes("-fullscreen"))
 
 if __name__ == "__main__":
-    app = AdvancedDigitalClock()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--display", choices=("labels", "glyphs", "cells"), default="labels", help="render the time with CTkLabels, a pre-rendered glyph atlas or fixed canvas text cells")
+    parser.add_argument("--themes", metavar="PATH", help="extra themes from a .json or .toml file (or set CLOCK_THEMES)")
+    parser.add_argument("--theme", help="name of the theme to start with")
+    parser.add_argument("--power", choices=sorted(POWER_PROFILES), help="power profile; \"low\" turns off the pulse and suspends while hidden (or set CLOCK_POWER)")
+    parser.add_argument("--profile", metavar="PATH", help="write tick timings to a .json or .prom file (or set CLOCK_PROFILE)")
+    parser.add_argument("--profile-overlay", action="store_true", help="show tick timings on screen (or set CLOCK_PROFILE_OVERLAY=1)")
+    parser.add_argument("--alarms", metavar="PATH", help="keep alarms and timers in this append-only file (or set CLOCK_ALARMS)")
+    parser.add_argument("--alarm", action="append", default=[], metavar="WHEN[=LABEL]", help="add an alarm at an ISO time or daily at HH:MM[/mon-fri][@ZONE]; repeatable")
+    parser.add_argument("--timer", action="append", default=[], metavar="DURATION[=LABEL]", help="start a countdown timer, e.g. 90s, 15m or 1h; repeatable")
+    parser.add_argument("--startup-profile", action="store_true", help="print import times and startup milestones to stderr")
+    args = parser.parse_args()
+    
+    # Read and check theme, power and alarm options (and their environment variables) before any window opens
+    try:
+        themes = initial_themes(args.themes, args.theme)
+        profile = power_profile(args.power)
+        alarm_engine = create_alarm_engine(args.alarms)
+        for value in args.alarm:
+            alarm_engine.add(*parse_alarm_option(value))
+        for value in args.timer:
+            duration, _, label = value.partition("=")
+            alarm_engine.add_timer(parse_duration(duration), label)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    
+    app = AdvancedDigitalClock(
+        display_mode=args.display,
+        themes=themes,
+        power_profile=profile,
+        profile_output=args.profile,
+        profile_overlay=args.profile_overlay,
+        alarm_engine=alarm_engine
+    )
     app.mainloop()
\ No newline at end of file
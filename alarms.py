@@ -0,0 +1,430 @@
+"""Alarms and timers on one min-heap of monotonic deadlines, with an append-only log
+
+Rules:
+    once    spec is an ISO 8601 time, e.g. "2024-06-01T07:30:00+02:00"
+            (without an offset it is local time)
+    daily   spec is "HH:MM[:SS][/DAYS][@ZONE]", e.g. "06:00/mon-fri@Asia/Tokyo";
+            DAYS is a comma-separated list of days or day ranges
+    every   spec is "SECONDS@ANCHOR": every SECONDS after the POSIX time ANCHOR
+
+The log holds one compact JSON array per line: ["+", id, kind, spec, label]
+adds an alarm and ["-", id] removes one. Replaying it rebuilds the alarms;
+it is rewritten without dead lines once they outnumber the live ones.
+"""
+import heapq
+import json
+import math
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+KINDS = ("once", "daily", "every")
+# Countdown timers offered in the context menu, in minutes
+TIMER_PRESETS = (1, 5, 15)
+# Rebuild the heap when the wall clock moves against the monotonic clock (clock set, suspend)
+RESYNC_THRESHOLD = 1.0
+# Dead log lines tolerated before the log is compacted
+COMPACT_MIN_DEAD = 64
+# Longest wake-up timer while hidden; a later deadline is re-armed when it fires
+MAX_WAKEUP = 3600.0
+
+
+class Alarm(NamedTuple):
+    alarm_id: int
+    kind: str
+    spec: str
+    label: str
+
+
+def parse_duration(value):
+    """Seconds from "90", "90s", "15m" or "24h" """
+    units = {"s": 1, "m": 60, "h": 3600}
+    try:
+        if value[-1:] in units:
+            seconds = float(value[:-1]) * units[value[-1]]
+        else:
+            seconds = float(value)
+    except ValueError:
+        raise ValueError(f"Duration must be seconds or end in s, m or h, e.g. 90s or 15m; got {value!r}") from None
+    if not (math.isfinite(seconds) and seconds > 0):
+        raise ValueError(f"Duration must be positive and finite, got {value!r}")
+    return seconds
+
+
+def format_duration(seconds):
+    """Shortest of "90s", "15m" or "24h" for a whole number of seconds"""
+    for unit, size in (("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size:g}{unit}"
+    return f"{seconds:g}s"
+
+
+def day_number(name):
+    try:
+        return DAY_NAMES.index(name.strip()[:3])
+    except ValueError:
+        raise ValueError(f"Unknown day {name!r}; use mon, tue, wed, thu, fri, sat or sun") from None
+
+
+def parse_days(text):
+    """Weekday numbers (Monday is 0) from "mon-fri,sun\""""
+    days = set()
+    for part in text.lower().split(","):
+        first, _, last = part.partition("-")
+        start = day_number(first)
+        end = day_number(last) if last else start
+        # Ranges may wrap around the week, e.g. "fri-mon"
+        days.update((start + step) % 7 for step in range((end - start) % 7 + 1))
+    return frozenset(days)
+
+
+def parse_daily(spec):
+    """(hour, minute, second, weekdays or None, tz or None) from a daily spec"""
+    spec, _, zone = spec.partition("@")
+    clock, _, days = spec.partition("/")
+    try:
+        parts = [int(part) for part in clock.split(":")]
+    except ValueError:
+        parts = []
+    if len(parts) not in (2, 3) or not (0 <= parts[0] < 24 and 0 <= parts[1] < 60 and 0 <= (parts + [0])[2] < 60):
+        raise ValueError(f"Daily alarm time must be HH:MM or HH:MM:SS, got {clock!r}")
+    hour, minute, second = (parts + [0])[:3]
+    try:
+        tz = ZoneInfo(zone) if zone else None
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone {zone!r}") from None
+    return hour, minute, second, parse_days(days) if days else None, tz
+
+
+def next_occurrence(alarm, after):
+    """First time strictly after the aware datetime after that the alarm fires, or None"""
+    if alarm.kind == "once":
+        moment = datetime.fromisoformat(alarm.spec)
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        return moment
+    if alarm.kind == "every":
+        interval, _, anchor = alarm.spec.partition("@")
+        interval, anchor = float(interval), float(anchor)
+        if interval <= 0:
+            raise ValueError("Repeat interval must be positive")
+        elapsed = after.timestamp() - anchor
+        count = max(int(elapsed // interval) + 1, 1)
+        return datetime.fromtimestamp(anchor + count * interval, timezone.utc)
+    if alarm.kind == "daily":
+        hour, minute, second, days, tz = parse_daily(alarm.spec)
+        local = after.astimezone(tz)
+        for offset in range(8):
+            day = local.date() + timedelta(days=offset)
+            if days is not None and day.weekday() not in days:
+                continue
+            moment = datetime(day.year, day.month, day.day, hour, minute, second, tzinfo=local.tzinfo if tz is None else tz)
+            if tz is None:
+                # Resolve the local offset for that day, not today's
+                moment = moment.replace(tzinfo=None).astimezone()
+            if moment > after:
+                return moment
+        return None
+    raise ValueError(f"Unknown alarm kind: {alarm.kind}")
+
+
+class AlarmLog:
+    """Append-only alarm file; replayed at startup, compacted when mostly dead lines"""
+
+    def __init__(self, path):
+        self.path = path
+        self.live_lines = 0
+        self.dead_lines = 0
+
+    def load(self):
+        """Alarms by id, replayed from the file"""
+        alarms = {}
+        if not os.path.exists(self.path):
+            return alarms
+        with open(self.path, "rb+") as handle:
+            data = handle.read()
+            if data and not data.endswith(b"\n"):
+                # A torn final line from an interrupted write; cut it off so the
+                # next append starts on a line of its own instead of joining it
+                data = data[:data.rfind(b"\n") + 1]
+                handle.truncate(len(data))
+        for line in data.decode("utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, list) or not record:
+                continue
+            if record[0] == "+" and len(record) == 5:
+                alarms[record[1]] = Alarm(*record[1:5])
+            elif record[0] == "-" and len(record) == 2:
+                alarms.pop(record[1], None)
+                self.dead_lines += 2
+        self.live_lines = len(alarms)
+        return alarms
+
+    def _append(self, record):
+        with open(self.path, "a") as handle:
+            handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def added(self, alarm):
+        self._append(["+", *alarm])
+        self.live_lines += 1
+
+    def removed(self, alarm_id, alarms):
+        self._append(["-", alarm_id])
+        self.live_lines -= 1
+        # The add line and the remove line are both dead now
+        self.dead_lines += 2
+        if self.dead_lines > max(self.live_lines, COMPACT_MIN_DEAD):
+            self.compact(alarms)
+
+    def compact(self, alarms):
+        """Rewrite the file with only the live alarms"""
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as handle:
+            for alarm in alarms.values():
+                handle.write(json.dumps(["+", *alarm], separators=(",", ":")) + "\n")
+        os.replace(temporary, self.path)
+        self.live_lines = len(alarms)
+        self.dead_lines = 0
+
+
+class AlarmEngine:
+    """All alarms and timers in one heap of (monotonic deadline, sequence, id)
+
+    due() peeks at the heap top, so a tick with nothing to fire is O(1); each
+    fired alarm costs O(log n), and a recurring one is pushed back with its
+    next deadline after now, so it fires at most once per call however many
+    occurrences passed since the last one. Removed and rescheduled alarms
+    leave stale heap entries that are skipped by sequence number.
+    """
+
+    def __init__(self, log=None, monotonic=time.monotonic, wall=time.time):
+        self.log = log
+        self._monotonic = monotonic
+        self._wall = wall
+        self._heap = []
+        self._sequence = 0
+        self._current = {}
+        self._next_fire = {}
+        self._offset = wall() - monotonic()
+        self.alarms = log.load() if log is not None else {}
+        self._next_id = max(self.alarms, default=0) + 1
+        for alarm in self.alarms.values():
+            self._schedule(alarm)
+
+    def __len__(self):
+        return len(self.alarms)
+
+    def _now(self):
+        return datetime.fromtimestamp(self._monotonic() + self._offset, timezone.utc)
+
+    def _schedule(self, alarm, after=None):
+        # A once alarm keeps its time even if already past, so it fires on the next tick
+        moment = next_occurrence(alarm, after or self._now())
+        if moment is None:
+            return
+        self._sequence += 1
+        self._current[alarm.alarm_id] = self._sequence
+        self._next_fire[alarm.alarm_id] = moment
+        heapq.heappush(self._heap, (moment.timestamp() - self._offset, self._sequence, alarm.alarm_id))
+
+    def add(self, kind, spec, label=""):
+        """Add and persist an alarm; an identical live alarm is returned instead of duplicated"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown alarm kind: {kind}")
+        for alarm in self.alarms.values():
+            if (alarm.kind, alarm.spec, alarm.label) == (kind, spec, label):
+                return alarm
+        alarm = Alarm(self._next_id, kind, spec, label)
+        # Validate the rule before it is stored
+        next_occurrence(alarm, self._now())
+        self._next_id += 1
+        self.alarms[alarm.alarm_id] = alarm
+        if self.log is not None:
+            self.log.added(alarm)
+        self._schedule(alarm)
+        return alarm
+
+    def add_timer(self, seconds, label=""):
+        """Countdown timer, stored as a once alarm at its wall-clock end"""
+        # Rounded up, as the spec keeps whole seconds and a timer must not end early
+        end = datetime.fromtimestamp(math.ceil(self._now().timestamp() + seconds), timezone.utc)
+        return self.add("once", end.isoformat(timespec="seconds"), label or f"{format_duration(seconds)} timer")
+
+    def add_repeating(self, seconds, label=""):
+        """Alarm every seconds, starting from now"""
+        return self.add("every", f"{seconds:g}@{self._now().timestamp():.0f}", label)
+
+    def remove(self, alarm_id):
+        if self.alarms.pop(alarm_id, None) is None:
+            return
+        # Its heap entry goes stale and is skipped when it reaches the top
+        self._current.pop(alarm_id, None)
+        self._next_fire.pop(alarm_id, None)
+        if self.log is not None:
+            self.log.removed(alarm_id, self.alarms)
+
+    def due(self):
+        """Alarms whose deadline has passed, in deadline order; recurring ones are rescheduled"""
+        heap = self._heap
+        if not heap:
+            return []
+        mono = self._monotonic()
+        if abs(self._wall() - mono - self._offset) > RESYNC_THRESHOLD:
+            self.resync()
+            heap = self._heap
+        if not heap or heap[0][0] > mono:
+            return []
+
+        fired = []
+        now = datetime.fromtimestamp(mono + self._offset, timezone.utc)
+        while heap and heap[0][0] <= mono:
+            _, sequence, alarm_id = heapq.heappop(heap)
+            if self._current.get(alarm_id) != sequence:
+                continue
+            alarm = self.alarms[alarm_id]
+            fired.append(alarm)
+            if alarm.kind == "once":
+                self.remove(alarm_id)
+            else:
+                # Occurrences missed while ticking was paused ring once, not once each
+                self._schedule(alarm, max(self._next_fire[alarm_id], now))
+        return fired
+
+    def next_deadline(self):
+        """Monotonic time of the earliest pending alarm, or None"""
+        heap = self._heap
+        while heap and self._current.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def resync(self):
+        """Recompute every deadline after the wall clock moved against the monotonic clock"""
+        mono = self._monotonic()
+        self._offset = self._wall() - mono
+        now = datetime.fromtimestamp(mono + self._offset, timezone.utc)
+        previous = self._next_fire
+        self._heap = []
+        self._current.clear()
+        self._next_fire = {}
+        for alarm in self.alarms.values():
+            moment = previous.get(alarm.alarm_id)
+            if moment is None or moment > now:
+                self._schedule(alarm)
+                continue
+            # Came due while suspended or skipped by a clock jump: due now, so it
+            # rings once and due() reschedules it from now
+            self._sequence += 1
+            self._current[alarm.alarm_id] = self._sequence
+            self._next_fire[alarm.alarm_id] = moment
+            heapq.heappush(self._heap, (mono, self._sequence, alarm.alarm_id))
+
+    def upcoming(self, limit=10):
+        """(alarm, aware datetime) pairs for the next alarms, soonest first"""
+        return sorted(
+            ((self.alarms[alarm_id], moment) for alarm_id, moment in self._next_fire.items()),
+            key=lambda item: item[1]
+        )[:limit]
+
+
+def describe_alarm(alarm, moment=None):
+    """Menu and label text for an alarm, with its next time in local time if given"""
+    name = alarm.label or alarm.spec
+    if moment is None:
+        return f"Alarm: {name}"
+    return f"{moment.astimezone():%a %H:%M:%S}  {name}"
+
+
+class AlarmController:
+    """Rings a clock window's alarms and fills its Alarms menu
+
+    The clock calls poll() on its ticks. While the power saver has the
+    window hidden, ticking once a minute or not at all, one after() timer
+    is kept for the earliest deadline so alarms still ring on time.
+    on_change runs when alarms start ringing from that timer or are dismissed.
+    """
+
+    def __init__(self, window, engine, power_saver, on_change):
+        self.window = window
+        self.engine = engine
+        self.power_saver = power_saver
+        self.on_change = on_change
+        self.ringing = []
+        self._wakeup = None
+        power_saver.listeners.append(lambda mode: self.arm())
+        self.arm()
+
+    def poll(self):
+        """Ring the alarms that came due; True if any did"""
+        fired = self.engine.due()
+        if fired:
+            self.ringing.extend(fired)
+            self.window.bell()
+        return bool(fired)
+
+    def dismiss(self):
+        self.ringing.clear()
+        self.on_change()
+
+    def banner(self, now, accent_color, text_color):
+        """(text, blinking color) for the date label while an alarm rings, else None"""
+        if not self.ringing:
+            return None
+        return describe_alarm(self.ringing[-1]), accent_color if now.second % 2 == 0 else text_color
+
+    def arm(self):
+        """Keep one wake-up timer for the earliest deadline while the window is hidden"""
+        if self._wakeup is not None:
+            self.window.after_cancel(self._wakeup)
+            self._wakeup = None
+        deadline = self.engine.next_deadline()
+        if deadline is None or not self.power_saver.hidden:
+            return
+        delay = min(max(deadline - time.monotonic(), 0.0), MAX_WAKEUP)
+        # Round up so the timer never fires just before the deadline
+        self._wakeup = self.window.after(math.ceil(delay * 1000) + 1, self._wake)
+
+    def _wake(self):
+        self._wakeup = None
+        if self.poll():
+            self.on_change()
+        self.arm()
+
+    def fill_menu(self, menu):
+        """Rebuild the Alarms submenu; used as its postcommand"""
+        menu.delete(0, "end")
+        menu.add_command(label="Dismiss", command=self.dismiss, state="normal" if self.ringing else "disabled")
+        for minutes in TIMER_PRESETS:
+            menu.add_command(
+                label=f"Start {minutes}-Minute Timer",
+                command=lambda seconds=minutes * 60: self.engine.add_timer(seconds)
+            )
+        upcoming = self.engine.upcoming()
+        if upcoming:
+            menu.add_separator()
+        for alarm, moment in upcoming:
+            menu.add_command(
+                label=f"Cancel {describe_alarm(alarm, moment)}",
+                command=lambda alarm_id=alarm.alarm_id: self.engine.remove(alarm_id)
+            )
+
+
+def parse_alarm_option(value):
+    """(kind, spec, label) from a --alarm value: an ISO time or a daily spec, then "=label\""""
+    spec, _, label = value.partition("=")
+    try:
+        datetime.fromisoformat(spec)
+    except ValueError:
+        return "daily", spec, label
+    return "once", spec, label
+
+
+def create_alarm_engine(path=None):
+    """Engine persisted to path, falling back to CLOCK_ALARMS; in memory only without either"""
+    path = path or os.environ.get("CLOCK_ALARMS")
+    return AlarmEngine(AlarmLog(path) if path else None)
@@ -0,0 +1,324 @@
+"""Benchmarks for the clock hot paths, with JSON baselines and regression thresholds
+
+Usage:
+    python benchmarks/bench_clocks.py                      # compare with benchmarks/baseline.json
+    python benchmarks/bench_clocks.py --update-baseline    # record a new baseline
+    python benchmarks/bench_clocks.py --threshold 0.1      # fail on >10% regressions
+
+Both clocks are driven by a SteppedTime source that advances 200 ms per
+tick. The Tk benchmarks need a display. Without DISPLAY the runner starts Xvfb if
+it is installed, and otherwise skips them and runs only the headless ones.
+Each Tk case runs in its own interpreter, so its peak RSS is its own.
+The raster, sprite and export benchmarks need numpy and are skipped without it.
+startup_ms is the median of several constructions of each clock.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clock_time import SteppedTime
+
+# Ticks start just before an hour rollover so hour labels change too
+BENCH_START = datetime(2024, 1, 1, 9, 59, 0)
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+# Time step of a 60 fps sweep frame
+SWEEP_STEP = timedelta(microseconds=16667)
+# Windowed and fullscreen-class analog sizes
+CLOCK_SIZES = (300, 600, 1080, 2160)
+# AdvancedDigitalClock display modes
+DISPLAY_MODES = ("labels", "glyphs", "cells")
+# Metrics where larger is better; every other metric regresses when it grows
+HIGHER_IS_BETTER = ("ticks_per_sec", "calls_per_sec", "frames_per_sec", "label_updates_skipped")
+# Clock constructions per startup_ms; one sample is too noisy for the threshold
+STARTUP_RUNS = 5
+
+
+def load_script(filename, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def ensure_display():
+    """Make sure Tk can open a display; returns the Xvfb process if one was started"""
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        return None
+    display = ":99"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "3840x2160x24"], stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(1.0)
+    return process
+
+
+def peak_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux; it is the process's high-water mark
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def timed(function, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        function()
+    return count / (time.perf_counter() - started)
+
+
+def allocations(function, count):
+    """Net allocated blocks and bytes per call, traced with tracemalloc"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(count):
+        function()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "alloc_blocks_per_tick": sum(stat.count_diff for stat in stats) / count,
+        "alloc_bytes_per_tick": sum(stat.size_diff for stat in stats) / count,
+        "traced_peak_bytes": peak,
+    }
+
+
+def start_app(factory, runs=STARTUP_RUNS):
+    """Construct a clock and run its deferred startup; returns (app, median milliseconds to first frame)
+
+    The clock is built runs times and all but the last are destroyed again.
+    """
+    samples = []
+    app = None
+    for _ in range(runs):
+        if app is not None:
+            app.destroy()
+        started = time.perf_counter()
+        app = factory()
+        samples.append((time.perf_counter() - started) * 1000)
+        app.update()
+        app.tick_scheduler.stop()
+    return app, statistics.median(samples)
+
+
+def tick_function(app):
+    """One tick including the Tk redraw it triggers"""
+    def tick():
+        app.update_clock()
+        app.update_idletasks()
+    return tick
+
+
+def bench_analog(clock_size, ticks):
+    module = load_script("Analog-Clock.py", "analog_clock")
+    results = {}
+    app, startup_ms = start_app(
+        lambda: module.AdvancedAnalogClock(clock_size=clock_size, time_source=SteppedTime(BENCH_START))
+    )
+    tick = tick_function(app)
+    metrics = {
+        "startup_ms": startup_ms,
+        "ticks_per_sec": timed(tick, ticks),
+        "canvas_items": len(app.clock_canvas.find_all()),
+    }
+    metrics.update(allocations(tick, min(ticks, 500)))
+    results[f"analog.update_clock.{clock_size}"] = metrics
+
+    results[f"analog.draw_clock_face.{clock_size}"] = {
+        "calls_per_sec": timed(lambda: (app.draw_clock_face(), app.update_idletasks()), max(ticks // 20, 10)),
+        "canvas_items": len(app.clock_canvas.find_all()),
+    }
+    results[f"analog.change_theme.{clock_size}"] = {
+        "calls_per_sec": timed(lambda: (app.change_theme(), app.update_idletasks()), max(ticks // 20, 10)),
+    }
+    app.destroy()
+    metrics["peak_rss_bytes"] = peak_rss_bytes()
+    return results
+
+
+def bench_analog_sweep(ticks):
+    # Sweep frames at 60 fps: most ticks only move the second hand
+    module = load_script("Analog-Clock.py", "analog_clock")
+    app, _ = start_app(
+        lambda: module.AdvancedAnalogClock(time_source=SteppedTime(BENCH_START, SWEEP_STEP), sweep=True), runs=1
+    )
+    tick = tick_function(app)
+    metrics = {"ticks_per_sec": timed(tick, ticks)}
+    metrics.update(allocations(tick, min(ticks, 500)))
+    app.destroy()
+    metrics["peak_rss_bytes"] = peak_rss_bytes()
+    return {"analog.update_clock.sweep": metrics}
+
+
+def bench_digital(display_mode, ticks):
+    module = load_script("Digital-Clock.py", "digital_clock")
+    results = {}
+    suffix = "" if display_mode == "labels" else f".{display_mode}"
+    app, startup_ms = start_app(
+        lambda: module.AdvancedDigitalClock(time_source=SteppedTime(BENCH_START), display_mode=display_mode)
+    )
+    tick = tick_function(app)
+    metrics = {"startup_ms": startup_ms, "ticks_per_sec": timed(tick, ticks)}
+    metrics.update(allocations(tick, min(ticks, 500)))
+    metrics["label_updates_skipped"] = app.label_binder.stats()["skipped"]
+    results[f"digital.update_clock{suffix}"] = metrics
+    results[f"digital.change_theme{suffix}"] = {
+        "calls_per_sec": timed(lambda: (app.change_theme(), app.update_idletasks()), max(ticks // 20, 10)),
+    }
+    app.destroy()
+    metrics["peak_rss_bytes"] = peak_rss_bytes()
+    return results
+
+
+# One Tk case per clock size, the sweep and each digital display mode
+TK_CASES = (
+    tuple(f"analog:{clock_size}" for clock_size in CLOCK_SIZES)
+    + ("analog:sweep",)
+    + tuple(f"digital:{display_mode}" for display_mode in DISPLAY_MODES)
+)
+
+
+def run_case(case, ticks):
+    """Results of one Tk case, measured in this process"""
+    kind, _, variant = case.partition(":")
+    if kind == "analog":
+        return bench_analog_sweep(ticks) if variant == "sweep" else bench_analog(int(variant), ticks)
+    return bench_digital(variant, ticks)
+
+
+def run_isolated(case, ticks):
+    """Run one Tk case in a fresh interpreter, so ru_maxrss covers only that case"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--case", case, "--ticks", str(ticks)],
+        stdout=subprocess.PIPE, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def bench_headless(ticks):
+    from clock_colors import PulsePalette, fade_color
+    from clock_themes import default_theme
+
+    colors = dict(default_theme().colors)
+    palette = PulsePalette(colors["secondary"])
+    results = {
+        "colors.fade_color": {
+            "calls_per_sec": timed(lambda: fade_color("#FF4081", "#FFFFFF", 0.37), ticks * 10),
+        },
+        "colors.pulse_palette": {
+            "calls_per_sec": timed(lambda: palette.color(5), ticks * 10),
+        },
+    }
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy is not installed: skipping raster, sprite and export benchmarks", file=sys.stderr)
+        return results
+    from clock_export import hand_positions
+    from clock_geometry import get_geometry
+    from raster_backend import render_clock
+    from sprite_cache import SpriteCache
+
+    fake = SteppedTime(BENCH_START, timedelta(seconds=1))
+    for clock_size in CLOCK_SIZES[:2]:
+        results[f"raster.render_clock.{clock_size}"] = {
+            "frames_per_sec": timed(lambda: render_clock(fake.now(), colors, clock_size), max(ticks // 20, 10)),
+        }
+        cache = SpriteCache()
+        results[f"sprites.compose.{clock_size}"] = {
+            "frames_per_sec": timed(lambda: cache.compose(clock_size, fake.now(), colors), ticks),
+            "cache_bytes": cache.stats()["bytes_used"],
+        }
+
+    geometry = get_geometry(300, 140)
+    timestamps = 1704067200 + np.arange(100000) / 30
+    started = time.perf_counter()
+    hand_positions(timestamps, geometry)
+    results["export.hand_positions.100k"] = {"frames_per_sec": len(timestamps) / (time.perf_counter() - started)}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """List of regressions beyond the threshold relative to the baseline"""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(name, {}).get(metric)
+            if not reference:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                regressed = value < reference * (1 - threshold)
+            else:
+                regressed = value > reference * (1 + threshold)
+            if regressed:
+                regressions.append(f"{name} {metric}: {value:.4g} vs baseline {reference:.4g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=2000, help="ticks per tick-loop benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--case", choices=TK_CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Child process of run_isolated: print this case's results for the parent
+        json.dump(run_case(args.case, args.ticks), sys.stdout)
+        return 0
+
+    xvfb = ensure_display()
+    try:
+        results = bench_headless(args.ticks)
+        if os.environ.get("DISPLAY"):
+            for case in TK_CASES:
+                results.update(run_isolated(case, args.ticks))
+        else:
+            print("No display and no Xvfb: skipping Tk benchmarks", file=sys.stderr)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    for name, metrics in sorted(results.items()):
+        print(name)
+        for metric, value in metrics.items():
+            print(f"    {metric:<24} {value:,.2f}")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Color helpers shared by the analog and digital clocks"""
+import math
+from functools import lru_cache
+
+
+def parse_color(color):
+    """Split a #RRGGBB string into an (r, g, b) tuple"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def fade_color(color1, color2, ratio):
+    """Blend between two hex colors"""
+    r1, g1, b1 = parse_color(color1)
+    r2, g2, b2 = parse_color(color2)
+    r = int(r1 + (r2 - r1) * ratio)
+    g = int(g1 + (g2 - g1) * ratio)
+    b = int(b1 + (b2 - b1) * ratio)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+@lru_cache(maxsize=32)
+def pulse_gradient(base_color, target_color, steps):
+    """Pulse colors for animation steps -1 .. steps + 1 (the loop overshoots by one)"""
+    return tuple(
+        fade_color(base_color, target_color, 0.5 + math.sin(step / steps * math.pi) * 0.5)
+        for step in range(-1, steps + 2)
+    )
+
+
+class PulsePalette:
+    """Precomputed pulse gradient for one theme's secondary color"""
+
+    def __init__(self, base_color, target_color="#FFFFFF", steps=10):
+        self.base_color = base_color
+        self.target_color = target_color
+        self.steps = steps
+        self.colors = pulse_gradient(base_color, target_color, steps)
+
+    def color(self, step):
+        """Color for an animation step in -1 .. steps + 1"""
+        return self.colors[step + 1]
+
+    def advance(self, step, direction):
+        """Next (step, direction) of the back-and-forth pulse"""
+        step += direction
+        if step > self.steps or step < 0:
+            direction = -direction
+        return step, direction
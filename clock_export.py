@@ -0,0 +1,310 @@
+"""Vectorized batch frame generation for time-lapse and video export"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import NamedTuple
+import numpy as np
+from zoneinfo import ZoneInfo
+from clock_geometry import SECOND_SUBDIVISIONS, get_geometry
+from raster_backend import encode_png
+from sprite_cache import SpriteCache
+
+# Frames rendered per batch; bounds memory regardless of export length
+DEFAULT_BATCH_SIZE = 256
+# Frames per worker task in parallel exports
+DEFAULT_CHUNK_FRAMES = 4096
+# Tasks queued per worker; bounds the chunks waiting to be streamed to stdout
+TASKS_PER_WORKER = 2
+
+# Sprite cache of a worker process, shared by every task it runs
+_worker_cache = None
+
+
+class HandBatch(NamedTuple):
+    """Hand positions for a batch of timestamps, one array element per frame"""
+    hour_index: np.ndarray
+    minute_index: np.ndarray
+    second_index: np.ndarray
+    hour_angle: np.ndarray
+    minute_angle: np.ndarray
+    second_angle: np.ndarray
+    hour_end: np.ndarray
+    minute_end: np.ndarray
+    second_end: np.ndarray
+
+
+class ExportStats(NamedTuple):
+    frames: int
+    seconds: float
+
+    @property
+    def fps(self):
+        return self.frames / self.seconds if self.seconds else 0.0
+
+
+def utc_offsets(timestamps, tz):
+    """UTC offset in seconds for each POSIX timestamp, resolved once per distinct minute
+
+    tz=None uses the system local zone, like datetime.now() in the live clocks.
+    """
+    minutes, inverse = np.unique(np.floor_divide(timestamps, 60).astype(np.int64), return_inverse=True)
+    offsets = np.array([
+        datetime.fromtimestamp(int(minute) * 60, tz).astimezone(tz).utcoffset().total_seconds()
+        for minute in minutes
+    ])
+    return offsets[inverse]
+
+
+def hand_positions(timestamps, geometry, tz=None, subsecond=False):
+    """Hand angles and endpoints for an array of POSIX timestamps in one NumPy pass
+
+    Uses the update_clock formulas: the hour hand moves 0.5 degrees per
+    minute, the minute hand 0.1 degrees per second and the second hand 6
+    degrees per second (plus sub-second steps when subsecond is set).
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    # Whole microseconds, as datetime has them; a float fraction of a ~1.7e9
+    # timestamp would put e.g. .6 s at 2.9999998 steps and truncate to 2
+    local = np.round((timestamps + utc_offsets(timestamps, tz)) * 1000000).astype(np.int64)
+    microsecond = local % 1000000
+    day_seconds = local // 1000000 % 86400
+    hour = day_seconds // 3600
+    minute = day_seconds // 60 % 60
+    second = day_seconds % 60
+
+    hour_angle = (hour % 12) * 30 + minute * 0.5 - 90
+    minute_angle = minute * 6 + second * 0.1 - 90
+    second_angle = second * 6 - 90.0
+    second_step = np.zeros_like(second)
+    if subsecond:
+        second_step = microsecond * SECOND_SUBDIVISIONS // 1000000
+        second_angle = second_angle + second_step * (6 / SECOND_SUBDIVISIONS)
+
+    def endpoints(angle, length):
+        radians = np.radians(angle)
+        return np.stack([
+            geometry.center_x + length * np.cos(radians),
+            geometry.center_y + length * np.sin(radians),
+        ], axis=1)
+
+    return HandBatch(
+        hour_index=(hour % 12) * 60 + minute,
+        minute_index=minute * 60 + second,
+        second_index=second * SECOND_SUBDIVISIONS + second_step,
+        hour_angle=hour_angle,
+        minute_angle=minute_angle,
+        second_angle=second_angle,
+        hour_end=endpoints(hour_angle, geometry.hour_length),
+        minute_end=endpoints(minute_angle, geometry.minute_length),
+        second_end=endpoints(second_angle, geometry.second_length),
+    )
+
+
+def timestamp_batches(start, duration, step, batch_size=DEFAULT_BATCH_SIZE):
+    """Lazily yield arrays of timestamps covering [start, start + duration)"""
+    total = int(round(duration / step))
+    for first in range(0, total, batch_size):
+        count = min(batch_size, total - first)
+        yield start + (first + np.arange(count)) * step
+
+
+def render_batches(batches, colors, clock_size=300, tz=None, subsecond=False, cache=None):
+    """Yield RGBA frames for an iterable of timestamp arrays"""
+    cache = cache or SpriteCache()
+    geometry = get_geometry(clock_size, clock_size // 2 - 10)
+    for timestamps in batches:
+        positions = hand_positions(timestamps, geometry, tz, subsecond)
+        for hour, minute, second in zip(
+            positions.hour_index.tolist(),
+            positions.minute_index.tolist(),
+            positions.second_index.tolist()
+        ):
+            yield cache.compose_indices(clock_size, colors, hour, minute, second)
+
+
+class RawVideoWriter:
+    """Writes raw rgb24 frames, e.g. for piping into ffmpeg -f rawvideo"""
+
+    def __init__(self, stream, close_stream=False):
+        self.stream = stream
+        self.close_stream = close_stream
+
+    def write(self, frame):
+        self.stream.write(np.ascontiguousarray(frame[:, :, :3]).tobytes())
+
+    def close(self):
+        if self.close_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+class ImageSequenceWriter:
+    """Writes numbered PNG (or PPM) files into a directory"""
+
+    def __init__(self, directory, image_format="png", first_index=0, prefix="frame"):
+        if image_format not in ("png", "ppm"):
+            raise ValueError(f"Unknown image format: {image_format}")
+        self.directory = directory
+        self.image_format = image_format
+        self.prefix = prefix
+        self.count = first_index
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame):
+        path = os.path.join(self.directory, f"{self.prefix}_{self.count:07d}.{self.image_format}")
+        if self.image_format == "png":
+            data = encode_png(frame)
+        else:
+            height, width = frame.shape[:2]
+            data = f"P6 {width} {height} 255\n".encode("ascii") + np.ascontiguousarray(frame[:, :, :3]).tobytes()
+        with open(path, "wb") as handle:
+            handle.write(data)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def export_frames(frames, writer, progress_every=0, log=sys.stderr):
+    """Stream frames into a writer and report throughput"""
+    started = time.perf_counter()
+    count = 0
+    for frame in frames:
+        writer.write(frame)
+        count += 1
+        if progress_every and count % progress_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{count} frames, {count / elapsed:.1f} fps", file=log)
+    writer.close()
+    return ExportStats(count, time.perf_counter() - started)
+
+
+def parse_start(value, tz):
+    """ISO 8601 start time; naive values are taken in the export time zone"""
+    start = datetime.fromisoformat(value)
+    if start.tzinfo is None and tz is not None:
+        start = start.replace(tzinfo=tz)
+    return start.timestamp()
+
+
+class ExportTask(NamedTuple):
+    """A contiguous range of frames for one zone, rendered by one worker"""
+    output: str
+    image_format: str
+    zone: str
+    output_frame: int
+    first_frame: int
+    count: int
+    start: float
+    step: float
+    clock_size: int
+    colors: dict
+    subsecond: bool
+
+
+def worker_cache():
+    """The calling process's sprite cache, created on first use"""
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = SpriteCache()
+    return _worker_cache
+
+
+def render_task(task):
+    """Worker entry point: render a frame range into the output at task.output_frame"""
+    tz = ZoneInfo(task.zone) if task.zone else None
+    timestamps = task.start + (task.first_frame + np.arange(task.count)) * task.step
+    batches = (timestamps[i:i + DEFAULT_BATCH_SIZE] for i in range(0, task.count, DEFAULT_BATCH_SIZE))
+    # Faces and hands are rasterized once per worker, not once per task or zone
+    frames = render_batches(batches, task.colors, task.clock_size, tz, task.subsecond, worker_cache())
+
+    if task.image_format == "raw":
+        frame_bytes = task.clock_size * task.clock_size * 3
+        output = np.memmap(
+            task.output,
+            dtype=np.uint8,
+            # The shared output file is preallocated; a chunk file is created here
+            mode="r+" if os.path.exists(task.output) else "w+",
+            offset=task.output_frame * frame_bytes,
+            shape=(task.count, task.clock_size, task.clock_size, 3)
+        )
+        for index, frame in enumerate(frames):
+            output[index] = frame[:, :, :3]
+        output.flush()
+        del output
+    else:
+        prefix = task.zone.replace("/", "_") if task.zone else "frame"
+        writer = ImageSequenceWriter(task.output, task.image_format, task.first_frame, prefix)
+        for frame in frames:
+            writer.write(frame)
+    return task.count
+
+
+def parallel_export(output, start, duration, step, colors, clock_size=300, zones=(None,), image_format="raw",
+                    workers=None, chunk_frames=DEFAULT_CHUNK_FRAMES, subsecond=False, progress=None):
+    """Split an export across a process pool; raw frames land zone by zone, in time order
+
+    Raw output is a memory-mapped file that workers fill in place. With
+    output "-" each task renders into its own temporary chunk file, which the
+    parent copies to stdout in order and deletes; only a bounded window of
+    tasks is in flight, so disk use stays at a few chunks however long the
+    export. Image formats write numbered files per zone.
+    """
+    frames_per_zone = int(round(duration / step))
+    total = frames_per_zone * len(zones)
+    frame_bytes = clock_size * clock_size * 3
+    workers = workers or os.cpu_count() or 1
+    to_stdout = image_format == "raw" and output == "-"
+    chunk_directory = tempfile.mkdtemp(prefix="clock-export-") if to_stdout else None
+    if image_format == "raw" and not to_stdout:
+        with open(output, "wb") as handle:
+            handle.truncate(total * frame_bytes)
+
+    def tasks():
+        for zone_index, zone in enumerate(zones):
+            for first in range(0, frames_per_zone, chunk_frames):
+                output_frame = zone_index * frames_per_zone + first
+                if to_stdout:
+                    task_output, output_frame = os.path.join(chunk_directory, f"{output_frame}.raw"), 0
+                else:
+                    task_output = output
+                yield ExportTask(task_output, image_format, zone, output_frame, first, min(chunk_frames, frames_per_zone - first),
+                                 start, step, clock_size, colors, subsecond)
+
+    started = time.perf_counter()
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = tasks()
+            in_flight = deque()
+            for task in pending:
+                in_flight.append((task, pool.submit(render_task, task)))
+                if len(in_flight) >= workers * TASKS_PER_WORKER:
+                    break
+            # Collect in submission order so the output can be streamed in sequence
+            while in_flight:
+                task, future = in_flight.popleft()
+                count = future.result()
+                if to_stdout:
+                    with open(task.output, "rb") as source:
+                        shutil.copyfileobj(source, sys.stdout.buffer)
+                    os.remove(task.output)
+                task = next(pending, None)
+                if task is not None:
+                    in_flight.append((task, pool.submit(render_task, task)))
+                done += count
+                if progress:
+                    elapsed = time.perf_counter() - started
+                    print(f"{done}/{total} frames, {done / elapsed:.1f} fps", file=progress)
+        if to_stdout:
+            sys.stdout.buffer.flush()
+    finally:
+        if chunk_directory is not None:
+            shutil.rmtree(chunk_directory, ignore_errors=True)
+    return ExportStats(done, time.perf_counter() - started)
@@ -0,0 +1,106 @@
+"""Retained-mode analog clock face on a Tk canvas"""
+import tkinter as tk
+from clock_geometry import get_geometry
+from clock_render import Circle, Line, face_primitives, hand_primitives, hub_primitives
+
+
+def create_item(canvas, primitive):
+    """Create the canvas item for one render primitive"""
+    if isinstance(primitive, Line):
+        return canvas.create_line(
+            primitive.x0, primitive.y0,
+            primitive.x1, primitive.y1,
+            fill=primitive.color,
+            width=primitive.width,
+            capstyle=tk.ROUND if primitive.round_cap else tk.BUTT,
+            tags=primitive.tags
+        )
+    if isinstance(primitive, Circle):
+        return canvas.create_oval(
+            primitive.x - primitive.radius, primitive.y - primitive.radius,
+            primitive.x + primitive.radius, primitive.y + primitive.radius,
+            outline=primitive.outline,
+            fill=primitive.fill or "",
+            width=primitive.width,
+            tags=primitive.tags
+        )
+    return canvas.create_text(
+        primitive.x, primitive.y,
+        text=primitive.text,
+        fill=primitive.color,
+        font=("Helvetica", primitive.size, "bold"),
+        tags=primitive.tags
+    )
+
+
+class AnalogFace:
+    """Static face items built once, hand items moved in place every tick"""
+
+    def __init__(self, canvas, clock_size, clock_radius):
+        self.canvas = canvas
+        self.geometry = get_geometry(clock_size, clock_radius)
+        self.center_x = self.geometry.center_x
+        self.center_y = self.geometry.center_y
+        self.clock_radius = clock_radius
+        self.second_color = None
+        self.bezel_color = None
+
+    def draw(self, text_color, primary_color, secondary_color):
+        """Build the static face and tagged hand items"""
+        geometry = self.geometry
+
+        # Clear canvas
+        self.canvas.delete("all")
+
+        # Hands start at 12:00:00; set_hands moves them
+        for primitive in (
+            face_primitives(geometry, text_color)
+            + hand_primitives(geometry, 0, 0, 0, primary_color, secondary_color)
+            + hub_primitives(geometry, secondary_color)
+        ):
+            create_item(self.canvas, primitive)
+        self.second_color = secondary_color
+        self.bezel_color = text_color
+
+    def recolor(self, text_color, primary_color, secondary_color, second_color=None):
+        """Apply new colors to the existing canvas items"""
+        self.canvas.itemconfigure("marker", fill=text_color)
+        self.set_bezel_color(text_color)
+        self.canvas.itemconfigure("hour_hand", fill=primary_color)
+        self.canvas.itemconfigure("minute_hand", fill=primary_color)
+        self.canvas.itemconfigure("hub", fill=secondary_color, outline=secondary_color)
+        self.set_second_color(second_color)
+
+    def set_bezel_color(self, color):
+        """Recolor the outer ring, e.g. to flash a ringing alarm"""
+        if color != self.bezel_color:
+            self.bezel_color = color
+            self.canvas.itemconfigure("bezel", outline=color)
+
+    def set_second_color(self, second_color):
+        if second_color is not None and second_color != self.second_color:
+            self.second_color = second_color
+            self.canvas.itemconfigure("second_hand", fill=second_color)
+
+    def set_hands(self, hour, minute, second, second_color=None, microsecond=None):
+        """Move the hands to a time, looking endpoints up in the geometry tables
+
+        With a microsecond the second hand is placed for sweeping motion.
+        """
+        geometry = self.geometry
+        hour_x, hour_y = geometry.hour_hand(hour, minute)
+        minute_x, minute_y = geometry.minute_hand(minute, second)
+
+        self.canvas.coords("hour_hand", self.center_x, self.center_y, hour_x, hour_y)
+        self.canvas.coords("minute_hand", self.center_x, self.center_y, minute_x, minute_y)
+        if microsecond is None:
+            self.canvas.coords("second_hand", self.center_x, self.center_y, *geometry.second_hand(second))
+            self.set_second_color(second_color)
+        else:
+            self.sweep(second, microsecond, second_color)
+
+    def sweep(self, second, microsecond, second_color=None):
+        """Move only the second hand; sweep frames within one second touch nothing else"""
+        second_x, second_y = self.geometry.sweep_hand(second, microsecond)
+        self.canvas.coords("second_hand", self.center_x, self.center_y, second_x, second_y)
+        self.set_second_color(second_color)
@@ -0,0 +1,119 @@
+"""Precomputed trig tables for the analog clock face and hands"""
+import math
+from functools import cached_property, lru_cache
+
+# Sub-second steps of the second hand (5 matches the 200 ms tick)
+SECOND_SUBDIVISIONS = 5
+# Sub-second steps of the sweeping second hand (one per frame at 60 fps)
+SWEEP_SUBDIVISIONS = 60
+
+
+def _unit_table(steps, step_degrees):
+    """Unit vectors for angles 0, step, 2*step, ... measured from 12 o'clock"""
+    table = []
+    for i in range(steps):
+        angle = math.radians(i * step_degrees - 90)
+        table.append((math.cos(angle), math.sin(angle)))
+    return tuple(table)
+
+
+# 60 tick positions (6 degree steps)
+TICK_UNITS = _unit_table(60, 6)
+# Hour hand: hour * 30 + minute * 0.5, indexed by hour * 60 + minute
+HOUR_UNITS = _unit_table(720, 0.5)
+# Minute hand: minute * 6 + second * 0.1, indexed by minute * 60 + second
+MINUTE_UNITS = _unit_table(3600, 0.1)
+# Second hand: second * 6 plus sub-second steps
+SECOND_UNITS = _unit_table(60 * SECOND_SUBDIVISIONS, 6 / SECOND_SUBDIVISIONS)
+
+
+def hour_index(hour, minute):
+    """Position of the hour hand in HOUR_UNITS"""
+    return (hour % 12) * 60 + minute
+
+
+def minute_index(minute, second):
+    """Position of the minute hand in MINUTE_UNITS"""
+    return minute * 60 + second
+
+
+def second_index(second, microsecond=0):
+    """Position of the second hand in SECOND_UNITS"""
+    return second * SECOND_SUBDIVISIONS + microsecond * SECOND_SUBDIVISIONS // 1000000
+
+
+def sweep_index(second, microsecond):
+    """Position of the sweeping second hand; 0.1 degree steps, the same angles as MINUTE_UNITS"""
+    return second * SWEEP_SUBDIVISIONS + microsecond * SWEEP_SUBDIVISIONS // 1000000
+
+
+class ClockGeometry:
+    """Face and hand coordinates for one clock size, scaled from the unit tables"""
+
+    def __init__(self, clock_size, clock_radius):
+        self.clock_size = clock_size
+        self.clock_radius = clock_radius
+        self.center_x = clock_size // 2
+        self.center_y = clock_size // 2
+
+        self.hour_length = clock_radius * 0.5
+        self.minute_length = clock_radius * 0.7
+        self.second_length = clock_radius * 0.8
+
+        # Face markers: (inner_x, inner_y, outer_x, outer_y)
+        self.hour_markers = tuple(
+            self._segment(TICK_UNITS[i], clock_radius - 20, clock_radius)
+            for i in range(0, 60, 5)
+        )
+        self.minute_markers = tuple(
+            self._segment(TICK_UNITS[i], clock_radius - 10, clock_radius)
+            for i in range(60) if i % 5 != 0
+        )
+        # Hour numbers: (x, y, label), starting at 12
+        self.hour_numbers = tuple(
+            self._point(TICK_UNITS[i * 5], clock_radius - 40) + (str(i or 12),)
+            for i in range(12)
+        )
+
+        # Hand endpoints, one entry per discrete position
+        self.hour_points = tuple(self._point(u, self.hour_length) for u in HOUR_UNITS)
+        self.minute_points = tuple(self._point(u, self.minute_length) for u in MINUTE_UNITS)
+        self.second_points = tuple(self._point(u, self.second_length) for u in SECOND_UNITS)
+        self.hand_points = {
+            "hour_hand": self.hour_points,
+            "minute_hand": self.minute_points,
+            "second_hand": self.second_points,
+        }
+
+    @cached_property
+    def sweep_points(self):
+        """Second hand endpoints in sweep steps, built on first use"""
+        return tuple(self._point(u, self.second_length) for u in MINUTE_UNITS)
+
+    def _point(self, unit, length):
+        return (self.center_x + length * unit[0], self.center_y + length * unit[1])
+
+    def _segment(self, unit, inner, outer):
+        return self._point(unit, inner) + self._point(unit, outer)
+
+    def hour_hand(self, hour, minute):
+        """Endpoint of the hour hand for a 0-23 hour"""
+        return self.hour_points[hour_index(hour, minute)]
+
+    def minute_hand(self, minute, second):
+        """Endpoint of the minute hand"""
+        return self.minute_points[minute_index(minute, second)]
+
+    def second_hand(self, second, microsecond=0):
+        """Endpoint of the second hand, snapped to the nearest sub-second step"""
+        return self.second_points[second_index(second, microsecond)]
+
+    def sweep_hand(self, second, microsecond):
+        """Endpoint of the sweeping second hand"""
+        return self.sweep_points[sweep_index(second, microsecond)]
+
+
+@lru_cache(maxsize=8)
+def get_geometry(clock_size, clock_radius):
+    """Shared geometry for a size; a resize builds its tables once"""
+    return ClockGeometry(clock_size, clock_radius)
@@ -0,0 +1,82 @@
+"""Backend-agnostic drawing of the analog clock as a list of primitives"""
+from typing import NamedTuple
+from clock_geometry import hour_index, minute_index, second_index
+
+# Stroke width of each hand
+HAND_WIDTHS = {"hour_hand": 6, "minute_hand": 4, "second_hand": 2}
+
+
+class Line(NamedTuple):
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    color: str
+    width: float
+    round_cap: bool = False
+    tags: tuple = ()
+
+
+class Circle(NamedTuple):
+    x: float
+    y: float
+    radius: float
+    outline: str
+    fill: str = None
+    width: float = 1
+    tags: tuple = ()
+
+
+class Text(NamedTuple):
+    x: float
+    y: float
+    text: str
+    color: str
+    size: int
+    tags: tuple = ()
+
+
+def face_primitives(geometry, text_color):
+    """Bezel, tick marks and hour numbers; everything drawn under the hands"""
+    primitives = [
+        Circle(geometry.center_x, geometry.center_y, geometry.clock_radius, text_color, width=2, tags=("face", "bezel"))
+    ]
+    for marker in geometry.hour_markers:
+        primitives.append(Line(*marker, text_color, 3, tags=("face", "marker")))
+    for text_x, text_y, num in geometry.hour_numbers:
+        primitives.append(Text(text_x, text_y, num, text_color, 12, tags=("face", "marker")))
+    for marker in geometry.minute_markers:
+        primitives.append(Line(*marker, text_color, 1, tags=("face", "marker")))
+    return primitives
+
+
+def hand_line(geometry, hand, index, color):
+    """One hand ("hour_hand", "minute_hand" or "second_hand") at a table position"""
+    end_x, end_y = geometry.hand_points[hand][index]
+    return Line(geometry.center_x, geometry.center_y, end_x, end_y, color, HAND_WIDTHS[hand], True, ("hand", hand))
+
+
+def hand_primitives(geometry, hour, minute, second, primary_color, second_color, microsecond=0):
+    """The three hands for a time, using the same tables as the live clock"""
+    return [
+        hand_line(geometry, "hour_hand", hour_index(hour, minute), primary_color),
+        hand_line(geometry, "minute_hand", minute_index(minute, second), primary_color),
+        hand_line(geometry, "second_hand", second_index(second, microsecond), second_color),
+    ]
+
+
+def hub_primitives(geometry, secondary_color):
+    """Center circle drawn over the hands"""
+    return [Circle(geometry.center_x, geometry.center_y, 8, secondary_color, secondary_color, tags=("hub",))]
+
+
+def clock_primitives(geometry, now, colors, second_color=None):
+    """Full frame for a datetime; colors uses the theme keys (text, primary, secondary)"""
+    return (
+        face_primitives(geometry, colors["text"])
+        + hand_primitives(
+            geometry, now.hour, now.minute, now.second,
+            colors["primary"], second_color or colors["secondary"]
+        )
+        + hub_primitives(geometry, colors["secondary"])
+    )
@@ -0,0 +1,377 @@
+"""Asyncio HTTP server streaming clock state to browsers over WebSocket and SSE
+
+Every second the state is computed once, serialized once and the same bytes
+are written to every subscriber, so the per-client cost is a buffer append.
+Clients that stop reading are disconnected instead of buffering without limit.
+
+Routes:
+    /                   minimal browser client (analog canvas and digital readout)
+    /ws                 WebSocket stream of JSON updates
+    /events             Server-Sent Events stream of the same updates
+    /state              latest update as JSON
+    /themes             theme colors by name
+    /stats              subscriber and cache counters
+    /snapshot.png       analog face PNG; ?size=300&theme=Name, cached per minute
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+from clock_geometry import get_geometry, hour_index, minute_index, second_index, SECOND_SUBDIVISIONS
+from clock_render import face_primitives, hand_line, hub_primitives
+from clock_themes import load_themes
+from clock_time import SnapshotClock
+from tick_scheduler import BOUNDARY_MARGIN
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Bytes a subscriber may have queued before it is dropped as too slow
+MAX_BUFFERED = 64 * 1024
+# Largest request head accepted
+MAX_REQUEST_HEAD = 8192
+# Snapshot PNGs kept, keyed by (minute, size, theme)
+SNAPSHOT_CACHE_SIZE = 64
+SNAPSHOT_SIZES = (32, 2160)
+
+
+def websocket_frame(payload, opcode=0x1):
+    """One unmasked server-to-client WebSocket frame"""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, length))
+    elif length < 65536:
+        header = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+    return header + payload
+
+
+def websocket_accept(key):
+    return base64.b64encode(hashlib.sha1(key.encode("ascii") + WEBSOCKET_GUID).digest()).decode("ascii")
+
+
+class ClockState:
+    """The per-second clock state, computed with the same helpers as the Tk clocks
+
+    Labels come from SnapshotClock and hand angles from the clock_geometry
+    table indices, so browsers show exactly what AdvancedAnalogClock and
+    AdvancedDigitalClock would draw.
+    """
+
+    def __init__(self, time_source=None, themes=None):
+        self.snapshot_clock = SnapshotClock(time_source)
+        self.themes = themes or load_themes()
+        self.snapshot = None
+        self.payload = b"{}"
+        self.sse_message = b""
+        self.websocket_message = b""
+
+    def update(self):
+        """Recompute and pre-serialize the state; returns the JSON payload"""
+        now = self.snapshot = self.snapshot_clock.snapshot()
+        state = {
+            "time": now.now.timestamp(),
+            # Degrees from 12 o'clock; rounded, as float steps like 1278 * 0.1 carry noise
+            "hour": round(hour_index(now.hour, now.minute) * 0.5, 1),
+            "minute": round(minute_index(now.minute, now.second) * 0.1, 1),
+            "second": round(second_index(now.second) * 6 / SECOND_SUBDIVISIONS, 1),
+            "hour_text": now.hour_text,
+            "minute_text": now.minute_text,
+            "second_text": now.second_text,
+            "ampm": now.ampm,
+            "date": now.date_text,
+            "day": f"Day: {now.day_of_week}",
+            "week": f"Week: {now.week_number}",
+            "theme": self.themes.current.name,
+        }
+        self.payload = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        self.sse_message = b"data: " + self.payload + b"\n\n"
+        self.websocket_message = websocket_frame(self.payload)
+        return self.payload
+
+    def themes_json(self):
+        return json.dumps({theme.name: dict(theme.colors) for theme in self.themes.themes}).encode("utf-8")
+
+
+class SnapshotCache:
+    """PNG snapshots of the analog face with hour and minute hands, keyed by (minute, size, theme)
+
+    Rendering runs in the default executor; concurrent requests for the same
+    key share one render. A failed render is forgotten so the next request retries.
+    """
+
+    def __init__(self, max_entries=SNAPSHOT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, snapshot, clock_size, theme):
+        key = ((snapshot.now.date(), snapshot.hour, snapshot.minute), clock_size, theme.name)
+        future = self._entries.get(key)
+        if future is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return future
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, render_snapshot, snapshot.hour, snapshot.minute, clock_size, theme.colors)
+        self._entries[key] = future
+        future.add_done_callback(lambda done: self._forget_failed(key, done))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return future
+
+    def _forget_failed(self, key, future):
+        if not future.cancelled() and future.exception() is None:
+            return
+        if self._entries.get(key) is future:
+            del self._entries[key]
+
+
+def render_snapshot(hour, minute, clock_size, colors):
+    """PNG bytes of the face at a minute; there is no second hand to go stale"""
+    from raster_backend import RasterBackend
+
+    geometry = get_geometry(clock_size, clock_size // 2 - 10)
+    backend = RasterBackend(clock_size, clock_size, colors["bg"])
+    backend.render(
+        face_primitives(geometry, colors["text"])
+        + [
+            hand_line(geometry, "hour_hand", hour_index(hour, minute), colors["primary"]),
+            hand_line(geometry, "minute_hand", minute_index(minute, 0), colors["primary"]),
+        ]
+        + hub_primitives(geometry, colors["secondary"])
+    )
+    return backend.to_png()
+
+
+class ClockServer:
+    """Serves the clock page, state streams and snapshots; one tick feeds every subscriber"""
+
+    def __init__(self, state, host="127.0.0.1", port=8765):
+        self.state = state
+        self.host = host
+        self.port = port
+        self.snapshots = SnapshotCache()
+        self.sse_clients = set()
+        self.websocket_clients = set()
+        self.dropped = 0
+        self.ticks = 0
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_REQUEST_HEAD)
+        self.state.update()
+        ticker = asyncio.create_task(self.tick_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ticker.cancel()
+            # Drop the streams so their handlers finish before the loop shuts down
+            for writer in self.sse_clients | self.websocket_clients:
+                writer.transport.abort()
+            await asyncio.sleep(0.1)
+
+    async def tick_loop(self):
+        """Update on wall-clock second boundaries and broadcast the bytes once per client"""
+        while True:
+            wall = time.time()
+            await asyncio.sleep(int(wall) + 1 - wall + BOUNDARY_MARGIN)
+            self.state.update()
+            self.ticks += 1
+            self.broadcast(self.sse_clients, self.state.sse_message)
+            self.broadcast(self.websocket_clients, self.state.websocket_message)
+
+    def broadcast(self, clients, message):
+        slow = []
+        for writer in clients:
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                slow.append(writer)
+            else:
+                writer.write(message)
+        for writer in slow:
+            clients.discard(writer)
+            writer.close()
+            self.dropped += 1
+
+    def stats(self):
+        return {
+            "sse_clients": len(self.sse_clients),
+            "websocket_clients": len(self.websocket_clients),
+            "dropped": self.dropped,
+            "ticks": self.ticks,
+            "snapshot_hits": self.snapshots.hits,
+            "snapshot_misses": self.snapshots.misses,
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            await self.respond(writer, 400, b"Bad request")
+            return
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+
+        if method != "GET":
+            await self.respond(writer, 405, b"Method not allowed")
+        elif url.path == "/ws":
+            await self.serve_websocket(reader, writer, headers)
+        elif url.path == "/events":
+            await self.serve_events(reader, writer)
+        elif url.path == "/state":
+            await self.respond(writer, 200, self.state.payload, "application/json")
+        elif url.path == "/themes":
+            await self.respond(writer, 200, self.state.themes_json(), "application/json")
+        elif url.path == "/stats":
+            await self.respond(writer, 200, json.dumps(self.stats()).encode("utf-8"), "application/json")
+        elif url.path == "/snapshot.png":
+            await self.serve_snapshot(writer, query)
+        elif url.path == "/":
+            await self.respond(writer, 200, CLIENT_PAGE, "text/html; charset=utf-8")
+        else:
+            await self.respond(writer, 404, b"Not found")
+
+    async def respond(self, writer, status, body, content_type="text/plain", extra_headers=""):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}.get(status, "")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n{extra_headers}\r\n".encode("latin-1")
+            + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def serve_snapshot(self, writer, query):
+        try:
+            clock_size = int(query.get("size", ["300"])[0])
+            theme = self.state.themes.find(query["theme"][0]) if "theme" in query else self.state.themes.current
+        except ValueError:
+            await self.respond(writer, 400, b"Bad size or unknown theme")
+            return
+        if not SNAPSHOT_SIZES[0] <= clock_size <= SNAPSHOT_SIZES[1]:
+            await self.respond(writer, 400, b"Size out of range")
+            return
+        try:
+            png = await self.snapshots.get(self.state.snapshot, clock_size, theme)
+        except Exception as exc:
+            await self.respond(writer, 500, f"Snapshot rendering failed: {exc}".encode("utf-8"))
+            return
+        await self.respond(writer, 200, png, "image/png", "Cache-Control: max-age=60\r\n")
+
+    async def serve_events(self, reader, writer):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+            + self.state.sse_message
+        )
+        self.sse_clients.add(writer)
+        try:
+            # Nothing is expected from the client; reading detects the disconnect
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.sse_clients.discard(writer)
+            writer.close()
+
+    async def serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if headers.get("upgrade", "").lower() != "websocket" or not key:
+            await self.respond(writer, 400, b"Expected a WebSocket upgrade")
+            return
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            + f"Sec-WebSocket-Accept: {websocket_accept(key)}\r\n\r\n".encode("ascii")
+            + self.state.websocket_message
+        )
+        self.websocket_clients.add(writer)
+        try:
+            await self.read_websocket(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.websocket_clients.discard(writer)
+            writer.close()
+
+    async def read_websocket(self, reader, writer):
+        """Answer pings and close frames; client messages are otherwise ignored"""
+        while True:
+            first, second = await reader.readexactly(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await reader.readexactly(8), "big")
+            if length > MAX_REQUEST_HEAD:
+                return
+            mask = await reader.readexactly(4) if second & 0x80 else b"\0\0\0\0"
+            data = bytes(byte ^ mask[i % 4] for i, byte in enumerate(await reader.readexactly(length)))
+            if opcode == 0x8:
+                writer.write(websocket_frame(data[:2], 0x8))
+                return
+            if opcode == 0x9:
+                writer.write(websocket_frame(data, 0xA))
+
+
+CLIENT_PAGE = b"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Clock</title>
+<style>body{margin:0;display:flex;flex-direction:column;align-items:center;font-family:Helvetica,sans-serif}
+#time{font-size:80px;font-weight:bold}#date,#ampm{font-size:24px}#info{font-size:18px}</style></head>
+<body><div id="date"></div><canvas id="face" width="300" height="300"></canvas><div id="time"></div>
+<div id="ampm"></div><div id="info"></div>
+<script>
+let themes = {};
+fetch("/themes").then(r => r.json()).then(t => { themes = t; });
+function hand(ctx, degrees, length, width, color) {
+  const a = (degrees - 90) * Math.PI / 180;
+  ctx.beginPath(); ctx.moveTo(150, 150);
+  ctx.lineTo(150 + length * Math.cos(a), 150 + length * Math.sin(a));
+  ctx.lineWidth = width; ctx.lineCap = "round"; ctx.strokeStyle = color; ctx.stroke();
+}
+function render(s) {
+  const c = themes[s.theme] || {bg: "#121212", primary: "#4FC3F7", secondary: "#FF4081", text: "#E0E0E0", accent: "#7C4DFF"};
+  document.body.style.background = c.bg; document.body.style.color = c.text;
+  document.getElementById("date").textContent = s.date;
+  document.getElementById("time").textContent = s.hour_text + ":" + s.minute_text + ":" + s.second_text;
+  document.getElementById("ampm").textContent = s.ampm;
+  document.getElementById("info").textContent = s.day + "  " + s.week;
+  const ctx = document.getElementById("face").getContext("2d");
+  ctx.fillStyle = c.bg; ctx.fillRect(0, 0, 300, 300);
+  ctx.beginPath(); ctx.arc(150, 150, 140, 0, 2 * Math.PI); ctx.strokeStyle = c.text; ctx.lineWidth = 2; ctx.stroke();
+  hand(ctx, s.hour, 70, 6, c.primary); hand(ctx, s.minute, 98, 4, c.primary); hand(ctx, s.second, 112, 2, c.secondary);
+}
+function connect() {
+  const ws = new WebSocket((location.protocol === "https:" ? "wss://" : "ws://") + location.host + "/ws");
+  ws.onmessage = e => render(JSON.parse(e.data));
+  ws.onclose = () => setTimeout(connect, 1000);
+}
+if ("WebSocket" in window) connect();
+else new EventSource("/events").onmessage = e => render(JSON.parse(e.data));
+</script></body></html>
+"""
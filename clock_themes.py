@@ -0,0 +1,165 @@
+"""Theme registry: built-in and user themes compiled once, switched by index"""
+import json
+import os
+import re
+from types import MappingProxyType
+from clock_colors import PulsePalette, parse_color
+
+# Color keys every theme defines, in the same keys change_theme used
+COLOR_KEYS = ("bg", "primary", "secondary", "text", "accent")
+BUILTIN_THEMES = (
+    {"name": "Midnight", "bg": "#121212", "primary": "#4FC3F7", "secondary": "#FF4081", "text": "#E0E0E0", "accent": "#7C4DFF"},
+    {"name": "Neon", "bg": "#0A0A0A", "primary": "#00BCD4", "secondary": "#FF5252", "text": "#F5F5F5", "accent": "#E040FB"},
+    {"name": "Ember", "bg": "#1A1A1A", "primary": "#18FFFF", "secondary": "#FF6E40", "text": "#FFFFFF", "accent": "#B388FF"},
+    {"name": "Aurora", "bg": "#212121", "primary": "#64FFDA", "secondary": "#FF1744", "text": "#EEEEEE", "accent": "#651FFF"},
+)
+
+
+def check_color(name, key, color):
+    """Validate a #RRGGBB color from a theme definition"""
+    # Not int(..., 16) alone, which also takes signs and spaces that Tk rejects
+    if not isinstance(color, str) or not re.fullmatch(r"#[0-9A-Fa-f]{6}", color):
+        raise ValueError(f"Theme {name!r}: {key} must be a #RRGGBB color, got {color!r}")
+    return color.upper()
+
+
+class Theme:
+    """Immutable compiled theme: hex colors, parsed RGB tuples and the pulse gradient"""
+
+    __slots__ = ("name", "bg", "primary", "secondary", "text", "accent", "colors", "rgb", "pulse")
+
+    def __init__(self, name, bg, primary, secondary, text, accent):
+        colors = {key: check_color(name, key, color) for key, color in zip(COLOR_KEYS, (bg, primary, secondary, text, accent))}
+        set_slot = object.__setattr__
+        set_slot(self, "name", name)
+        for key, color in colors.items():
+            set_slot(self, key, color)
+        set_slot(self, "colors", MappingProxyType(colors))
+        set_slot(self, "rgb", MappingProxyType({key: parse_color(color) for key, color in colors.items()}))
+        set_slot(self, "pulse", PulsePalette(colors["secondary"]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Theme is immutable")
+
+    def __repr__(self):
+        return f"Theme({self.name!r})"
+
+    @classmethod
+    def from_dict(cls, definition):
+        if not isinstance(definition, dict):
+            raise ValueError(f"Theme must be a table of name and colors, got {definition!r}")
+        name = definition.get("name")
+        if not name or not isinstance(name, str):
+            raise ValueError(f"Theme without a name: {definition!r}")
+        missing = [key for key in COLOR_KEYS if key not in definition]
+        if missing:
+            raise ValueError(f"Theme {name!r} is missing {', '.join(missing)}")
+        return cls(name, *(definition[key] for key in COLOR_KEYS))
+
+
+def read_theme_file(path):
+    """Theme definitions from a JSON or TOML file
+
+    Either format holds a "themes" list of tables with a name and the five
+    color keys; a JSON file may also be the bare list.
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML theme files need Python 3.11 or newer") from None
+        with open(path, "rb") as handle:
+            data = tomllib.load(handle)
+    else:
+        with open(path) as handle:
+            data = json.load(handle)
+    definitions = data.get("themes", []) if isinstance(data, dict) else data
+    if not isinstance(definitions, list):
+        raise ValueError(f"{path}: expected a list of themes or a \"themes\" list")
+    try:
+        return [Theme.from_dict(definition) for definition in definitions]
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+
+
+class ThemeRegistry:
+    """Ordered compiled themes with the index of the current one
+
+    Switching is an index step or a name lookup, so it costs the same
+    however many themes are loaded.
+    """
+
+    def __init__(self, themes, current=0):
+        if not themes:
+            raise ValueError("A theme registry needs at least one theme")
+        self.themes = tuple(themes)
+        self._by_name = {theme.name.lower(): index for index, theme in enumerate(self.themes)}
+        self.index = current
+
+    def __len__(self):
+        return len(self.themes)
+
+    @property
+    def current(self):
+        return self.themes[self.index]
+
+    def names(self):
+        return [theme.name for theme in self.themes]
+
+    def next(self):
+        """Advance to the following theme, wrapping around"""
+        self.index = (self.index + 1) % len(self.themes)
+        return self.current
+
+    def _index_of(self, name):
+        index = self._by_name.get(name.lower())
+        if index is None:
+            raise ValueError(f"Unknown theme {name!r}; available: {', '.join(self.names())}")
+        return index
+
+    def find(self, name):
+        """The named theme (case-insensitive), without making it current"""
+        return self.themes[self._index_of(name)]
+
+    def select(self, name):
+        """Make the named theme current (case-insensitive)"""
+        self.index = self._index_of(name)
+        return self.current
+
+
+def default_theme():
+    """The first built-in theme, compiled on its own"""
+    return Theme.from_dict(BUILTIN_THEMES[0])
+
+
+def initial_themes(path=None, current=None):
+    """Registry to start with, or None while only default_theme() is needed
+
+    With no theme file or name nothing is read or compiled beyond the default,
+    and load_themes() can build the registry later.
+    """
+    if path or current or os.environ.get("CLOCK_THEMES"):
+        return load_themes(path, current)
+    return None
+
+
+def load_themes(path=None, current=None):
+    """Registry of the built-in themes plus a user theme file (or CLOCK_THEMES)
+
+    User themes are appended; one with a built-in name replaces it in place.
+    """
+    themes = [Theme.from_dict(definition) for definition in BUILTIN_THEMES]
+    path = path or os.environ.get("CLOCK_THEMES")
+    if path:
+        positions = {theme.name.lower(): index for index, theme in enumerate(themes)}
+        for theme in read_theme_file(path):
+            index = positions.get(theme.name.lower())
+            if index is None:
+                positions[theme.name.lower()] = len(themes)
+                themes.append(theme)
+            else:
+                themes[index] = theme
+    registry = ThemeRegistry(themes)
+    if current:
+        registry.select(current)
+    return registry
@@ -0,0 +1,121 @@
+"""Injectable time sources and cached per-second time snapshots"""
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+
+class SystemTime:
+    """Wall-clock time, optionally in a fixed time zone"""
+
+    def __init__(self, tz=None):
+        self.tz = tz
+
+    def now(self):
+        return datetime.now(self.tz)
+
+
+class FixedTime:
+    """Always the same instant"""
+
+    def __init__(self, moment):
+        self.moment = moment
+
+    def now(self):
+        return self.moment
+
+
+class SteppedTime:
+    """Advances by a fixed step on every call; deterministic ticks for tests and benchmarks"""
+
+    def __init__(self, start, step=timedelta(milliseconds=200)):
+        self.current = start
+        self.step = step
+
+    def now(self):
+        self.current += self.step
+        return self.current
+
+
+class AcceleratedTime:
+    """Runs from a start instant at a multiple of real time"""
+
+    def __init__(self, start, speed=60.0):
+        self.start = start
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self):
+        return self.start + timedelta(seconds=(time.monotonic() - self._origin) * self.speed)
+
+
+class ReplayTime:
+    """Plays back a recorded sequence of instants, holding the last one"""
+
+    def __init__(self, moments):
+        self._moments = iter(moments)
+        self._last = None
+
+    def now(self):
+        self._last = next(self._moments, self._last)
+        if self._last is None:
+            raise ValueError("ReplayTime has no instants to play back")
+        return self._last
+
+
+class TimeSnapshot(NamedTuple):
+    """Everything a clock displays for one instant, already formatted"""
+    now: datetime
+    hour: int
+    minute: int
+    second: int
+    microsecond: int
+    hour_text: str
+    minute_text: str
+    second_text: str
+    ampm: str
+    date_text: str
+    day_of_week: str
+    week_number: str
+
+
+class SnapshotClock:
+    """Builds snapshots from a time source, reformatting only what changed
+
+    Within the same second the previous snapshot is reused with the new
+    microsecond; date-level strings are only reformatted when the day rolls over.
+    """
+
+    def __init__(self, source=None):
+        self.source = source or SystemTime()
+        self._last = None
+        self._second_key = None
+        self._day_key = None
+        self._day_fields = None
+
+    def snapshot(self):
+        now = self.source.now()
+        second_key = (now.year, now.month, now.day, now.hour, now.minute, now.second)
+        if second_key == self._second_key:
+            if now.microsecond != self._last.microsecond:
+                self._last = self._last._replace(now=now, microsecond=now.microsecond)
+            return self._last
+
+        day_key = second_key[:3]
+        if day_key != self._day_key:
+            self._day_key = day_key
+            self._day_fields = (now.strftime("%A, %B %d, %Y"), now.strftime("%A"), now.strftime("%U"))
+
+        self._second_key = second_key
+        self._last = TimeSnapshot(
+            now,
+            now.hour,
+            now.minute,
+            now.second,
+            now.microsecond,
+            str(now.hour % 12 or 12),
+            f"{now.minute:02d}",
+            f"{now.second:02d}",
+            "AM" if now.hour < 12 else "PM",
+            *self._day_fields
+        )
+        return self._last
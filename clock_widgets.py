@@ -0,0 +1,95 @@
+"""Compact analog and digital clock widgets for hosting many zones in one window"""
+import tkinter as tk
+import customtkinter as ctk
+from clock_face import AnalogFace
+
+
+class AnalogClockWidget(ctk.CTkFrame):
+    """Analog face for one time zone, driven by an external tick"""
+
+    def __init__(self, master, tz, colors, label_binder, clock_size=160):
+        super().__init__(master, fg_color="transparent")
+        self.tz = tz
+        self.label_binder = label_binder
+
+        self.zone_label = ctk.CTkLabel(
+            self,
+            text=str(tz),
+            font=("Helvetica", 14, "bold"),
+            text_color=colors["text"]
+        )
+        self.zone_label.pack()
+
+        self.clock_canvas = tk.Canvas(
+            self,
+            width=clock_size,
+            height=clock_size,
+            bg=colors["bg"],
+            highlightthickness=0
+        )
+        self.clock_canvas.pack(pady=5)
+
+        # Widgets of the same size share one set of geometry tables
+        self.face = AnalogFace(self.clock_canvas, clock_size, clock_size // 2 - 10)
+        self.face.draw(colors["text"], colors["primary"], colors["secondary"])
+
+        self.info_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Helvetica", 12),
+            text_color=colors["accent"]
+        )
+        self.info_label.pack()
+
+    def render(self, now, second_color=None):
+        """Show a time already converted to this widget's zone"""
+        self.face.set_hands(now.hour % 12, now.minute, now.second, second_color)
+        self.label_binder.update(self.info_label, text=now.strftime("%a %d %b  %p"))
+
+
+class DigitalClockWidget(ctk.CTkFrame):
+    """Single-line digital readout for one time zone, driven by an external tick"""
+
+    def __init__(self, master, tz, colors, label_binder, font_size=36):
+        super().__init__(master, fg_color="transparent")
+        self.tz = tz
+        self.label_binder = label_binder
+        self._shown_second = None
+
+        self.zone_label = ctk.CTkLabel(
+            self,
+            text=str(tz),
+            font=("Helvetica", 14, "bold"),
+            text_color=colors["text"]
+        )
+        self.zone_label.pack()
+
+        self.time_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Helvetica", font_size, "bold"),
+            text_color=colors["primary"]
+        )
+        self.time_label.pack()
+
+        self.info_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Helvetica", 12),
+            text_color=colors["accent"]
+        )
+        self.info_label.pack()
+
+    def render(self, now, second_color=None):
+        """Show a time already converted to this widget's zone
+
+        There is no second hand to pulse, so pulse frames within the same
+        second return without formatting anything.
+        """
+        second = now.replace(microsecond=0)
+        if second == self._shown_second:
+            return
+        self._shown_second = second
+        hour = now.strftime("%I").lstrip("0")
+        self.label_binder.update(self.time_label, text=f"{hour}:{now:%M:%S}")
+        self.label_binder.update(self.info_label, text=now.strftime("%a %d %b  %p"))
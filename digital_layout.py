@@ -0,0 +1,133 @@
+"""Fixed-layout time cells for the digital clock with dirty-cell repainting"""
+import tkinter as tk
+from abc import ABC, abstractmethod
+import tkinter.font as tkfont
+
+# One character per cell: hour, colon, minute, colon, second, AM/PM
+TIME_CELLS = ("h1", "h2", "c1", "m1", "m2", "c2", "s1", "s2", "p1", "p2")
+COLON_CELLS = ("c1", "c2")
+AMPM_CELLS = ("p1", "p2")
+
+
+class CellLayout:
+    """Rectangles of every time cell, computed once; AM/PM sits on the baseline after a gap"""
+
+    def __init__(self, digit_size, colon_size, ampm_size, gap=10):
+        self.height = digit_size[1]
+        self.rects = {}
+        x = 0
+        for cell in TIME_CELLS:
+            if cell in COLON_CELLS:
+                width, height = colon_size
+            elif cell in AMPM_CELLS:
+                if cell == AMPM_CELLS[0]:
+                    x += gap
+                width, height = ampm_size
+            else:
+                width, height = digit_size
+            y = self.height - height
+            self.rects[cell] = (x, y, x + width, y + height)
+            x += width
+        self.width = x
+
+    def center(self, cell):
+        x0, y0, x1, y1 = self.rects[cell]
+        return (x0 + x1) / 2, (y0 + y1) / 2
+
+
+class DirtyCells:
+    """Tracks what each cell shows so only changed cells are repainted"""
+
+    def __init__(self):
+        self._shown = {}
+        self.repainted = 0
+        self.skipped = 0
+
+    def mark(self, cell, state):
+        """True if the cell must be repainted to show state"""
+        if self._shown.get(cell) == state:
+            self.skipped += 1
+            return False
+        self._shown[cell] = state
+        self.repainted += 1
+        return True
+
+    def reset(self):
+        """Force every cell to repaint on the next tick"""
+        self._shown.clear()
+
+    def stats(self):
+        return {"repainted": self.repainted, "skipped": self.skipped}
+
+
+class CellDisplay(ABC):
+    """Time readout on one canvas with a fixed cell layout
+
+    Subclasses create one canvas item per cell and implement paint(). A tick
+    repaints only the cells whose character or color changed, so Tk redraws
+    just those regions and no geometry manager runs in the steady state.
+    """
+
+    def __init__(self, master, background, layout, font_size, ampm_size):
+        self.layout = layout
+        self.font_size = font_size
+        self.ampm_size = ampm_size
+        self.canvas = tk.Canvas(
+            master,
+            width=layout.width,
+            height=layout.height,
+            bg=background,
+            highlightthickness=0
+        )
+        self.cells = DirtyCells()
+
+    @abstractmethod
+    def paint(self, cell, char, font_size, color):
+        """Draw char in cell at font_size and color"""
+
+    def _set(self, cell, char, font_size, color):
+        if self.cells.mark(cell, (char, font_size, color)):
+            self.paint(cell, char, font_size, color)
+
+    def show(self, hour_text, minute_text, second_text, ampm, hour_color, second_color, colon_color, ampm_color):
+        for cell, char in zip(("h1", "h2"), hour_text.rjust(2)):
+            self._set(cell, char, self.font_size, hour_color)
+        for cell, char in zip(("m1", "m2"), minute_text):
+            self._set(cell, char, self.font_size, hour_color)
+        for cell, char in zip(("s1", "s2"), second_text):
+            self._set(cell, char, self.font_size, second_color)
+        for cell in COLON_CELLS:
+            self._set(cell, ":", self.font_size, colon_color)
+        for cell, char in zip(AMPM_CELLS, ampm):
+            self._set(cell, char, self.ampm_size, ampm_color)
+
+    def set_background(self, background):
+        self.canvas.configure(bg=background)
+        self.cells.reset()
+
+
+class TextCellDisplay(CellDisplay):
+    """Cells drawn as canvas text items in fixed-width slots sized from the font"""
+
+    def __init__(self, master, background, font_size=80, ampm_size=24, family="Helvetica", gap=10):
+        self.digit_font = tkfont.Font(root=master, family=family, size=font_size, weight="bold")
+        self.ampm_font = tkfont.Font(root=master, family=family, size=ampm_size)
+        # Widest glyph per slot, so changing digits never shifts anything
+        digit_height = self.digit_font.metrics("linespace")
+        digit_size = (max(self.digit_font.measure(digit) for digit in "0123456789"), digit_height)
+        colon_size = (self.digit_font.measure(":") + 10, digit_height)
+        ampm_size_px = (max(self.ampm_font.measure(letter) for letter in "APM"), self.ampm_font.metrics("linespace"))
+        layout = CellLayout(digit_size, colon_size, ampm_size_px, gap)
+        super().__init__(master, background, layout, font_size, ampm_size)
+
+        self.items = {
+            cell: self.canvas.create_text(
+                *layout.center(cell),
+                text="",
+                font=self.ampm_font if cell in AMPM_CELLS else self.digit_font
+            )
+            for cell in TIME_CELLS
+        }
+
+    def paint(self, cell, char, font_size, color):
+        self.canvas.itemconfigure(self.items[cell], text=char, fill=color)
@@ -0,0 +1,119 @@
+"""Pre-rendered digit glyphs for the digital clock, shown as PhotoImages on one canvas"""
+import base64
+import tkinter as tk
+from clock_render import Circle, Line
+from digital_layout import CellDisplay, CellLayout
+from raster_backend import RasterBackend
+
+# Stroke font: segments in a unit cell (x and y from 0 to 1), seven-segment style
+SEGMENTS = {
+    "a": ((0, 0), (1, 0)),
+    "b": ((1, 0), (1, 0.5)),
+    "c": ((1, 0.5), (1, 1)),
+    "d": ((0, 1), (1, 1)),
+    "e": ((0, 0.5), (0, 1)),
+    "f": ((0, 0), (0, 0.5)),
+    "g": ((0, 0.5), (1, 0.5)),
+}
+STROKE_FONT = {
+    "0": "abcdef",
+    "1": "bc",
+    "2": "abged",
+    "3": "abgcd",
+    "4": "fgbc",
+    "5": "afgcd",
+    "6": "afgedc",
+    "7": "abc",
+    "8": "abcdefg",
+    "9": "abcdfg",
+    "A": "abcefg",
+    "P": "abefg",
+    "M": "bcef",
+    " ": "",
+}
+# M does not fit seven segments: add two diagonals meeting in the middle
+EXTRA_STROKES = {"M": (((0, 0), (0.5, 0.5)), ((1, 0), (0.5, 0.5)))}
+FONT_NAME = "segment"
+
+
+def glyph_size(char, font_size):
+    """(width, height) in pixels of a glyph image"""
+    stroke = max(font_size * 0.12, 2)
+    width = font_size * (0.25 if char == ":" else 0.55)
+    return int(width + stroke * 2), int(font_size + stroke * 2)
+
+
+def glyph_primitives(char, font_size, color):
+    """Render primitives for one glyph, inset so round caps stay inside the image"""
+    stroke = max(font_size * 0.12, 2)
+    width, height = glyph_size(char, font_size)
+    left, top = stroke, stroke
+    inner_width = width - stroke * 2
+    inner_height = height - stroke * 2
+
+    def point(x, y):
+        return left + x * inner_width, top + y * inner_height
+
+    if char == ":":
+        radius = stroke * 0.7
+        return [
+            Circle(*point(0.5, 0.3), radius, color, color),
+            Circle(*point(0.5, 0.7), radius, color, color),
+        ]
+    strokes = [SEGMENTS[name] for name in STROKE_FONT[char]] + list(EXTRA_STROKES.get(char, ()))
+    return [Line(*point(*start), *point(*end), color, stroke, True) for start, end in strokes]
+
+
+class GlyphAtlas:
+    """PhotoImages of glyphs, rasterized once per (font, size, color, background)"""
+
+    def __init__(self, master, background):
+        self.master = master
+        self.background = background
+        self._images = {}
+
+    def image(self, char, font_size, color):
+        key = (FONT_NAME, char, font_size, color, self.background)
+        image = self._images.get(key)
+        if image is None:
+            width, height = glyph_size(char, font_size)
+            backend = RasterBackend(width, height, self.background)
+            backend.render(glyph_primitives(char, font_size, color))
+            data = base64.b64encode(backend.to_ppm()).decode("ascii")
+            image = tk.PhotoImage(master=self.master, data=data, format="PPM")
+            self._images[key] = image
+        return image
+
+    def set_background(self, background):
+        """Drop every image; they are rendered onto the background color"""
+        self.background = background
+        self._images.clear()
+
+
+class GlyphDisplay(CellDisplay):
+    """Time readout composed from atlas images on a single canvas
+
+    A tick only swaps the image of cells whose glyph or color changed; the
+    colon blink and seconds pulse are color swaps.
+    """
+
+    def __init__(self, master, atlas, font_size=80, ampm_size=24, gap=10):
+        self.atlas = atlas
+        layout = CellLayout(
+            glyph_size("0", font_size),
+            glyph_size(":", font_size),
+            glyph_size("A", ampm_size),
+            gap
+        )
+        super().__init__(master, atlas.background, layout, font_size, ampm_size)
+        self.items = {
+            cell: self.canvas.create_image(x0, y0, anchor=tk.NW)
+            for cell, (x0, y0, _, _) in layout.rects.items()
+        }
+
+    def paint(self, cell, char, font_size, color):
+        self.canvas.itemconfigure(self.items[cell], image=self.atlas.image(char, font_size, color))
+
+    def set_background(self, background):
+        self.atlas.set_background(background)
+        super().set_background(background)
@@ -0,0 +1,26 @@
+"""Change detection for label updates"""
+
+
+class LabelBinder:
+    """Remembers what each label last rendered and skips redundant configure() calls"""
+
+    def __init__(self):
+        self._rendered = {}
+        self.applied = 0
+        self.skipped = 0
+
+    def update(self, label, **options):
+        """Configure only the options whose value changed; returns True if anything did"""
+        last = self._rendered.setdefault(label, {})
+        changed = {key: value for key, value in options.items() if last.get(key) != value}
+        if not changed:
+            self.skipped += 1
+            return False
+        label.configure(**changed)
+        last.update(changed)
+        self.applied += 1
+        return True
+
+    def stats(self):
+        """Counts of applied vs skipped updates"""
+        return {"applied": self.applied, "skipped": self.skipped}
@@ -0,0 +1,129 @@
+"""Adaptive tick rate: slow down or suspend the clock while nobody can see it"""
+import os
+import tkinter as tk
+from typing import NamedTuple
+from tick_scheduler import ANIMATION_FRAME_INTERVAL, SECOND_INTERVAL
+
+MINUTE_INTERVAL = 60.0
+# Tick period for the slow modes; "frame" uses the saver's frame_interval and "suspend" stops the scheduler
+MODE_INTERVALS = {"second": SECOND_INTERVAL, "minute": MINUTE_INTERVAL}
+HIDDEN_MODES = ("minute", "suspend")
+
+
+class PowerProfile(NamedTuple):
+    """How hard the clock works in each visibility state"""
+    pulse: bool             # run animation frames (pulse, sweeping hand) while visible
+    unfocused_pulse: bool   # keep animating when another window has the focus
+    hidden: str             # "minute" or "suspend" while unmapped or fully obscured
+
+
+POWER_PROFILES = {
+    "default": PowerProfile(pulse=True, unfocused_pulse=True, hidden="minute"),
+    "balanced": PowerProfile(pulse=True, unfocused_pulse=False, hidden="minute"),
+    "low": PowerProfile(pulse=False, unfocused_pulse=False, hidden="suspend"),
+}
+
+
+def power_profile(name=None):
+    """Profile by name, falling back to CLOCK_POWER and then the default profile"""
+    name = name or os.environ.get("CLOCK_POWER") or "default"
+    try:
+        return POWER_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown power profile {name!r}; available: {', '.join(POWER_PROFILES)}") from None
+
+
+class PowerSaver:
+    """Drives a TickScheduler from window map, visibility and focus events
+
+    While the window is iconified, withdrawn or fully covered the clock ticks
+    once a minute (or not at all); when it becomes visible again the resync
+    callback redraws it straight away and ticking restarts on the boundary.
+    """
+
+    def __init__(self, window, scheduler, profile=None, resync=None, frame_interval=ANIMATION_FRAME_INTERVAL):
+        self.window = window
+        self.scheduler = scheduler
+        self.frame_interval = frame_interval
+        self.profile = profile if isinstance(profile, PowerProfile) else power_profile(profile)
+        self.resync = resync
+        # Called with the new mode after every switch
+        self.listeners = []
+        self.mapped = True
+        self.obscured = False
+        self.focused = True
+        self.mode = self._wanted_mode()
+        scheduler.frame_interval = self._interval(self.mode)
+
+        for sequence in ("<Map>", "<Unmap>", "<Visibility>", "<FocusIn>", "<FocusOut>"):
+            window.bind(sequence, self._on_event, add="+")
+
+    @property
+    def pulse(self):
+        """True while the pulse animation should run"""
+        return self.mode == "frame"
+
+    @property
+    def hidden(self):
+        """True while the window is unmapped or covered and ticking is slowed or stopped"""
+        return self.mode in HIDDEN_MODES
+
+    def _interval(self, mode):
+        return self.frame_interval if mode == "frame" else MODE_INTERVALS[mode]
+
+    def set_frame_interval(self, frame_interval):
+        """Change the animation frame period, e.g. from a FramePacer"""
+        self.frame_interval = frame_interval
+        if self.mode == "frame":
+            self.scheduler.set_frame_interval(frame_interval)
+
+    def _wanted_mode(self):
+        if not self.mapped or self.obscured:
+            return self.profile.hidden
+        if self.profile.pulse and (self.focused or self.profile.unfocused_pulse):
+            return "frame"
+        return "second"
+
+    def _on_event(self, event):
+        kind = event.type
+        if kind in (tk.EventType.FocusIn, tk.EventType.FocusOut):
+            # Focus moves between child widgets too; only the application's focus matters
+            self.window.after_idle(self._update_focus)
+            return
+        # Bindings on the toplevel also fire for its children; they do not change visibility
+        if event.widget is not self.window:
+            return
+        if kind == tk.EventType.Map:
+            self.mapped = True
+            self.obscured = False
+        elif kind == tk.EventType.Unmap:
+            self.mapped = False
+        elif kind == tk.EventType.Visibility:
+            self.obscured = event.state == "VisibilityFullyObscured"
+        self.update()
+
+    def _update_focus(self):
+        try:
+            self.focused = self.window.focus_displayof() is not None
+        except KeyError:
+            # Focus is on an internal widget Tk cannot name (e.g. an open menu)
+            self.focused = True
+        self.update()
+
+    def update(self):
+        """Switch tick mode if the window state calls for it"""
+        mode = self._wanted_mode()
+        if mode == self.mode:
+            return
+        was_hidden = self.hidden
+        self.mode = mode
+        for listener in self.listeners:
+            listener(mode)
+        if mode == "suspend":
+            self.scheduler.stop()
+            return
+        self.scheduler.frame_interval = self._interval(mode)
+        if was_hidden and self.resync is not None:
+            # Show the right time now rather than on the next boundary
+            self.resync()
+        self.scheduler.start()
@@ -0,0 +1,192 @@
+"""Headless NumPy raster backend for clock render primitives"""
+import struct
+import zlib
+import numpy as np
+from clock_colors import parse_color
+from clock_geometry import get_geometry
+from clock_render import Circle, Line, Text, clock_primitives
+
+# 5x7 bitmap digits for the hour numbers (no font engine needed)
+DIGIT_FONT = {
+    "0": ("01110", "10001", "10011", "10101", "11001", "10001", "01110"),
+    "1": ("00100", "01100", "00100", "00100", "00100", "00100", "01110"),
+    "2": ("01110", "10001", "00001", "00010", "00100", "01000", "11111"),
+    "3": ("11111", "00010", "00100", "00010", "00001", "10001", "01110"),
+    "4": ("00010", "00110", "01010", "10010", "11111", "00010", "00010"),
+    "5": ("11111", "10000", "11110", "00001", "00001", "10001", "01110"),
+    "6": ("00110", "01000", "10000", "11110", "10001", "10001", "01110"),
+    "7": ("11111", "00001", "00010", "00100", "01000", "01000", "01000"),
+    "8": ("01110", "10001", "10001", "01110", "10001", "10001", "01110"),
+    "9": ("01110", "10001", "10001", "01111", "00001", "00010", "01100"),
+}
+DIGIT_BITMAPS = {
+    char: np.array([[bit == "1" for bit in row] for row in rows], dtype=np.float32)
+    for char, rows in DIGIT_FONT.items()
+}
+
+
+def pixel_grid(width, height, x0, y0, x1, y1):
+    """Box clipped to a width x height canvas and its pixel-center coordinates, or None if off-canvas"""
+    left = max(int(np.floor(x0)), 0)
+    top = max(int(np.floor(y0)), 0)
+    right = min(int(np.ceil(x1)) + 1, width)
+    bottom = min(int(np.ceil(y1)) + 1, height)
+    if left >= right or top >= bottom:
+        return None
+    ys, xs = np.mgrid[top:bottom, left:right].astype(np.float32)
+    return (slice(top, bottom), slice(left, right)), xs + 0.5, ys + 0.5
+
+
+def line_coverage(line, width, height):
+    """(region, coverage) of an antialiased line on a width x height canvas, or None if off-canvas
+
+    Needs no frame buffer, so hand sprites can be rasterized without one.
+    """
+    half = line.width / 2
+    grid = pixel_grid(
+        width, height,
+        min(line.x0, line.x1) - half - 1, min(line.y0, line.y1) - half - 1,
+        max(line.x0, line.x1) + half + 1, max(line.y0, line.y1) + half + 1
+    )
+    if grid is None:
+        return None
+    region, xs, ys = grid
+    dx, dy = line.x1 - line.x0, line.y1 - line.y0
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        along = np.zeros_like(xs)
+    else:
+        along = ((xs - line.x0) * dx + (ys - line.y0) * dy) / length_sq
+    if line.round_cap:
+        # Distance to the segment gives a capsule, i.e. round caps
+        t = np.clip(along, 0, 1)
+        distance = np.hypot(xs - (line.x0 + t * dx), ys - (line.y0 + t * dy))
+        coverage = np.clip(half - distance + 0.5, 0, 1)
+    else:
+        length = length_sq ** 0.5
+        distance = np.hypot(xs - (line.x0 + along * dx), ys - (line.y0 + along * dy))
+        coverage = np.clip(half - distance + 0.5, 0, 1)
+        end_distance = np.minimum(along, 1 - along) * length
+        coverage *= np.clip(end_distance + 0.5, 0, 1)
+    return region, coverage
+
+
+class RasterBackend:
+    """Draws primitives into an in-memory RGBA buffer with antialiased edges"""
+
+    def __init__(self, width, height, background="#000000", pixels=None):
+        self.width = width
+        self.height = height
+        self.background = background
+        if pixels is None:
+            self.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+            self.clear()
+        else:
+            # Draw on top of an existing frame, e.g. a cached face
+            self.pixels = pixels
+
+    def clear(self, background=None):
+        if background is not None:
+            self.background = background
+        self.pixels[:, :, :3] = parse_color(self.background)
+        self.pixels[:, :, 3] = 255
+
+    def render(self, primitives):
+        for primitive in primitives:
+            self.draw(primitive)
+        return self.pixels
+
+    def draw(self, primitive):
+        if isinstance(primitive, Line):
+            self.draw_line(primitive)
+        elif isinstance(primitive, Circle):
+            self.draw_circle(primitive)
+        elif isinstance(primitive, Text):
+            self.draw_text(primitive)
+        else:
+            raise TypeError(f"Unsupported primitive: {type(primitive).__name__}")
+
+    def _grid(self, x0, y0, x1, y1):
+        return pixel_grid(self.width, self.height, x0, y0, x1, y1)
+
+    def blend(self, region, coverage, color):
+        """Alpha-blend a solid color into a region by per-pixel coverage"""
+        target = self.pixels[region]
+        alpha = coverage[:, :, None]
+        rgb = np.array(parse_color(color), dtype=np.float32)
+        target[:, :, :3] = (target[:, :, :3] * (1 - alpha) + rgb * alpha + 0.5).astype(np.uint8)
+        target[:, :, 3] = np.maximum(target[:, :, 3], (coverage * 255).astype(np.uint8))
+
+    def draw_line(self, line):
+        coverage = line_coverage(line, self.width, self.height)
+        if coverage is not None:
+            self.blend(*coverage, line.color)
+
+    def draw_circle(self, circle):
+        reach = circle.radius + circle.width / 2 + 1
+        grid = self._grid(circle.x - reach, circle.y - reach, circle.x + reach, circle.y + reach)
+        if grid is None:
+            return
+        region, xs, ys = grid
+        distance = np.hypot(xs - circle.x, ys - circle.y)
+        if circle.fill:
+            self.blend(region, np.clip(circle.radius - distance + 0.5, 0, 1), circle.fill)
+        if circle.outline and circle.width:
+            ring = np.clip(circle.width / 2 - np.abs(distance - circle.radius) + 0.5, 0, 1)
+            self.blend(region, ring, circle.outline)
+
+    def draw_text(self, text):
+        # Glyphs are scaled so a 7-row digit is about as tall as the point size
+        scale = max(text.size / 7, 1)
+        glyph_width = 5 * scale
+        spacing = scale
+        total_width = len(text.text) * (glyph_width + spacing) - spacing
+        left = text.x - total_width / 2
+        top = text.y - 7 * scale / 2
+        for index, char in enumerate(text.text):
+            bitmap = DIGIT_BITMAPS.get(char)
+            if bitmap is None:
+                continue
+            glyph_left = left + index * (glyph_width + spacing)
+            grid = self._grid(glyph_left, top, glyph_left + glyph_width - 1, top + 7 * scale - 1)
+            if grid is None:
+                continue
+            region, xs, ys = grid
+            rows = np.clip(((ys - top) / scale).astype(int), 0, 6)
+            cols = np.clip(((xs - glyph_left) / scale).astype(int), 0, 4)
+            inside = (xs >= glyph_left) & (xs < glyph_left + glyph_width) & (ys >= top) & (ys < top + 7 * scale)
+            self.blend(region, bitmap[rows, cols] * inside, text.color)
+
+    def to_ppm(self):
+        """Binary PPM (P6) bytes of the RGB channels"""
+        header = f"P6 {self.width} {self.height} 255\n".encode("ascii")
+        return header + self.pixels[:, :, :3].tobytes()
+
+    def to_png(self):
+        return encode_png(self.pixels)
+
+
+def encode_png(pixels, compression=6):
+    """PNG bytes of an RGBA array, using only zlib"""
+    height, width = pixels.shape[:2]
+    # Each scanline starts with filter type 0 (none)
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw.tobytes(), compression))
+        + chunk(b"IEND", b"")
+    )
+
+
+def render_clock(now, colors, clock_size=300, second_color=None):
+    """Render one analog frame for a datetime without Tk; returns the RGBA array"""
+    geometry = get_geometry(clock_size, clock_size // 2 - 10)
+    backend = RasterBackend(clock_size, clock_size, colors["bg"])
+    return backend.render(clock_primitives(geometry, now, colors, second_color))
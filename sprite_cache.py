@@ -0,0 +1,112 @@
+"""Pre-rendered face and hand sprites for compositing analog frames"""
+from collections import OrderedDict
+import numpy as np
+from clock_geometry import get_geometry, hour_index, minute_index, second_index
+from clock_render import face_primitives, hand_line, hub_primitives
+from raster_backend import RasterBackend, line_coverage
+
+# Default memory cap for cached sprites
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class SpriteCache:
+    """LRU cache of rasterized faces and hand coverage masks, capped by memory
+
+    Faces are keyed by (size, background, text color). Hand masks store only
+    coverage, keyed by (size, hand, position), so every theme and every pulse
+    color reuses the same sprites.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _put(self, key, value, nbytes):
+        self._entries[key] = (value, nbytes)
+        self.bytes_used += nbytes
+        # Always keep the newest entry, even if it alone exceeds the cap
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.bytes_used -= evicted_bytes
+            self.evictions += 1
+        return value
+
+    def face(self, clock_size, colors):
+        """RGBA array of the static face (no hands) for a size and theme"""
+        key = ("face", clock_size, colors["bg"], colors["text"])
+        face = self._get(key)
+        if face is None:
+            geometry = get_geometry(clock_size, clock_size // 2 - 10)
+            backend = RasterBackend(clock_size, clock_size, colors["bg"])
+            face = backend.render(face_primitives(geometry, colors["text"]))
+            self._put(key, face, face.nbytes)
+        return face
+
+    def hand(self, clock_size, hand, index):
+        """(region, uint8 coverage mask) of one hand at a table position"""
+        key = ("hand", clock_size, hand, index)
+        sprite = self._get(key)
+        if sprite is None:
+            geometry = get_geometry(clock_size, clock_size // 2 - 10)
+            region, coverage = line_coverage(hand_line(geometry, hand, index, "#000000"), clock_size, clock_size)
+            sprite = (region, (coverage * 255 + 0.5).astype(np.uint8))
+            self._put(key, sprite, sprite[1].nbytes)
+        return sprite
+
+    def compose(self, clock_size, now, colors, second_color=None, microsecond=0):
+        """Frame for a datetime: face copy plus the three hand sprites and the hub"""
+        return self.compose_indices(
+            clock_size,
+            colors,
+            hour_index(now.hour, now.minute),
+            minute_index(now.minute, now.second),
+            second_index(now.second, microsecond),
+            second_color
+        )
+
+    def compose_indices(self, clock_size, colors, hour_position, minute_position, second_position, second_color=None):
+        """Frame for hand positions already resolved to table indices"""
+        face = self.face(clock_size, colors)
+        backend = RasterBackend(clock_size, clock_size, colors["bg"], pixels=face.copy())
+
+        hands = (
+            ("hour_hand", hour_position, colors["primary"]),
+            ("minute_hand", minute_position, colors["primary"]),
+            ("second_hand", second_position, second_color or colors["secondary"]),
+        )
+        for hand, index, color in hands:
+            region, mask = self.hand(clock_size, hand, index)
+            backend.blend(region, mask.astype(np.float32) * (1 / 255), color)
+
+        geometry = get_geometry(clock_size, clock_size // 2 - 10)
+        return backend.render(hub_primitives(geometry, colors["secondary"]))
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        """Memory use and hit rate, for tuning max_bytes"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
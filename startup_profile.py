@@ -0,0 +1,105 @@
+"""Opt-in cold-start profile: per-module import times and startup milestones
+
+The clock scripts call start() before their other imports when run with
+--startup-profile. Module load times are printed in the format of
+python -X importtime (microseconds, self and cumulative, nested by depth),
+followed by the time from start() to each milestone.
+"""
+import sys
+import time
+
+_started = None
+_milestones = []
+_imports = []
+# Child load time accumulated for each module being executed
+_stack = []
+
+
+class _TimedLoader:
+    """Wraps a loader for one module to time exec_module"""
+
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        create = getattr(self.loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        # The module only ever sees its real loader
+        module.__loader__ = module.__spec__.loader = self.loader
+        _stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - started
+            children = _stack.pop()
+            if _stack:
+                _stack[-1] += cumulative
+            _imports.append((len(_stack), module.__name__, cumulative - children, cumulative))
+
+
+class _TimingFinder:
+    """Meta path entry that defers to the other finders and times what they load"""
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is None:
+                continue
+            if hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader)
+            return spec
+        return None
+
+
+_finder = _TimingFinder()
+
+
+def start():
+    """Begin recording; imports made before this call are not seen"""
+    global _started
+    _started = time.perf_counter()
+    sys.meta_path.insert(0, _finder)
+
+
+def enabled():
+    return _started is not None
+
+
+def mark(milestone):
+    """Record the time since start() at which a startup step finished"""
+    if _started is not None:
+        _milestones.append((milestone, time.perf_counter() - _started))
+
+
+def after_first_paint(widget, callback):
+    """Run callback once the event loop has drawn the window for the first time"""
+    # Tk maps and draws in idle handlers; a timer queued from an idle handler runs after them
+    widget.after_idle(widget.after, 0, callback)
+
+
+def report(stream=None):
+    """Stop recording and print the import breakdown and milestones (stderr by default)"""
+    global _started
+    if _started is None:
+        return
+    stream = stream or sys.stderr
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+
+    print("import time: self [us] | cumulative | imported package", file=stream)
+    for depth, name, self_time, cumulative in _imports:
+        print(f"import time: {self_time * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}", file=stream)
+    total = sum(cumulative for depth, _, _, cumulative in _imports if depth == 0)
+    print(f"startup: {total * 1000:8.1f} ms  imports ({len(_imports)} modules)", file=stream)
+    for milestone, elapsed in _milestones:
+        print(f"startup: {elapsed * 1000:8.1f} ms  {milestone}", file=stream)
+    _started = None
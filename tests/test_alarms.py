@@ -0,0 +1,111 @@
+import pytest
+from alarms import AlarmEngine, AlarmLog, parse_alarm_option, parse_daily, parse_duration
+
+START = 1700000000.0
+
+
+class FakeClocks:
+    """Monotonic and wall clocks that only move when told to"""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        # Wall time that passed without the monotonic clock, as during suspend
+        self.suspended = 0.0
+
+    def monotonic(self):
+        return 1000.0 + self.elapsed
+
+    def wall(self):
+        return START + self.elapsed + self.suspended
+
+
+def make_engine(clocks, log=None):
+    return AlarmEngine(log, clocks.monotonic, clocks.wall)
+
+
+def test_missed_occurrences_fire_once():
+    clocks = FakeClocks()
+    engine = make_engine(clocks)
+    alarm = engine.add_repeating(10, "every 10s")
+    clocks.elapsed = 100
+    assert engine.due() == [alarm]
+    assert engine.due() == []
+    # Rescheduled from now, not from the missed occurrences
+    assert engine.next_deadline() == clocks.monotonic() + 10
+    clocks.elapsed = 110
+    assert engine.due() == [alarm]
+
+
+@pytest.mark.parametrize("kind, spec, gap", [
+    ("every", "60@1700000000", 300),
+    # START is 22:13:20 UTC, so this is due 100 seconds ahead
+    ("daily", "22:15@UTC", 3600),
+])
+def test_alarm_due_during_suspend_rings_once_on_resume(kind, spec, gap):
+    clocks = FakeClocks()
+    engine = make_engine(clocks)
+    alarm = engine.add(kind, spec)
+    clocks.suspended = gap
+    clocks.elapsed = 5
+    assert engine.due() == [alarm]
+    assert engine.due() == []
+    assert engine.next_deadline() > clocks.monotonic()
+
+
+def test_timer_fires_once_and_is_removed():
+    clocks = FakeClocks()
+    engine = make_engine(clocks)
+    engine.add_timer(5)
+    clocks.elapsed = 4
+    assert engine.due() == []
+    clocks.elapsed = 5
+    assert len(engine.due()) == 1
+    assert len(engine) == 0
+    assert engine.next_deadline() is None
+
+
+def test_log_replays_alarms(tmp_path):
+    clocks = FakeClocks()
+    path = str(tmp_path / "alarms.log")
+    engine = make_engine(clocks, AlarmLog(path))
+    kept = engine.add("daily", "07:30/mon-fri@Asia/Tokyo", "work")
+    removed = engine.add_timer(60)
+    engine.remove(removed.alarm_id)
+    assert make_engine(clocks, AlarmLog(path)).alarms == {kept.alarm_id: kept}
+
+
+def test_torn_final_line_does_not_swallow_the_next_alarm(tmp_path):
+    clocks = FakeClocks()
+    path = tmp_path / "alarms.log"
+    kept = make_engine(clocks, AlarmLog(str(path))).add("daily", "07:00", "first")
+    with open(path, "a") as handle:
+        # Valid JSON that is not a record is skipped too
+        handle.write('{"+": 3}\n')
+        handle.write('["+",2,"daily","08:0')
+    engine = make_engine(clocks, AlarmLog(str(path)))
+    added = engine.add("daily", "09:00", "second")
+    reloaded = make_engine(clocks, AlarmLog(str(path))).alarms
+    assert reloaded == {kept.alarm_id: kept, added.alarm_id: added}
+
+
+@pytest.mark.parametrize("spec", ["25:00", "7", "07:30/someday", "07:30@Nowhere/City"])
+def test_bad_daily_specs_raise_value_error(spec):
+    with pytest.raises(ValueError):
+        parse_daily(spec)
+
+
+def test_duration_units():
+    assert parse_duration("90") == 90
+    assert parse_duration("15m") == 900
+    assert parse_duration("1.5h") == 5400
+
+
+@pytest.mark.parametrize("value", ["", "soon", "-5m", "0", "inf", "nan", "1e400s"])
+def test_bad_durations_raise_value_error(value):
+    with pytest.raises(ValueError):
+        parse_duration(value)
+
+
+def test_alarm_option_kinds():
+    assert parse_alarm_option("2024-06-01T07:30=Flight") == ("once", "2024-06-01T07:30", "Flight")
+    assert parse_alarm_option("06:00@America/Toronto") == ("daily", "06:00@America/Toronto", "")
@@ -0,0 +1,21 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import pytest
+
+# clock_export needs numpy, which only the export tools use
+pytest.importorskip("numpy")
+
+from clock_export import hand_positions, timestamp_batches
+from clock_geometry import get_geometry, hour_index, minute_index, second_index
+
+
+def test_subsecond_positions_match_live_clock():
+    tz = ZoneInfo("Europe/Berlin")
+    geometry = get_geometry(300, 140)
+    for timestamps in timestamp_batches(1700000000.0, 180, 1 / 5):
+        positions = hand_positions(timestamps, geometry, tz, subsecond=True)
+        for index, timestamp in enumerate(timestamps.tolist()):
+            now = datetime.fromtimestamp(timestamp, tz)
+            assert positions.hour_index[index] == hour_index(now.hour, now.minute)
+            assert positions.minute_index[index] == minute_index(now.minute, now.second)
+            assert positions.second_index[index] == second_index(now.second, now.microsecond)
@@ -0,0 +1,64 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+import pytest
+import clock_server
+from clock_server import ClockState, SnapshotCache, websocket_accept, websocket_frame
+from clock_time import FixedTime
+
+
+def test_websocket_accept_matches_rfc_6455_sample():
+    assert websocket_accept("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+
+
+@pytest.mark.parametrize("length, header", [
+    (125, bytes((0x81, 125))),
+    (126, bytes((0x81, 126)) + (126).to_bytes(2, "big")),
+    (65535, bytes((0x81, 126)) + (65535).to_bytes(2, "big")),
+    (65536, bytes((0x81, 127)) + (65536).to_bytes(8, "big")),
+])
+def test_websocket_frame_length_boundaries(length, header):
+    frame = websocket_frame(b"x" * length)
+    assert frame[:len(header)] == header
+    assert len(frame) == len(header) + length
+
+
+def test_websocket_frame_opcode():
+    assert websocket_frame(b"\x03\xe8", 0x8) == b"\x88\x02\x03\xe8"
+
+
+def test_clock_state_payload():
+    state = ClockState(FixedTime(datetime(2024, 3, 5, 13, 37, 59, 900000, timezone.utc)))
+    payload = json.loads(state.update())
+    assert payload["hour"] == 48.5
+    # 2279 * 0.1 is 227.90000000000003 before rounding
+    assert payload["minute"] == 227.9
+    assert payload["second"] == 354.0
+    assert (payload["hour_text"], payload["minute_text"], payload["second_text"], payload["ampm"]) == ("1", "37", "59", "PM")
+    assert payload["date"] == "Tuesday, March 05, 2024"
+    assert payload["theme"] == state.themes.current.name
+    assert state.sse_message == b"data: " + state.payload + b"\n\n"
+    assert state.websocket_message == websocket_frame(state.payload)
+
+
+def test_failed_snapshot_is_not_cached(monkeypatch):
+    calls = []
+
+    def render_snapshot(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise ImportError("No module named 'numpy'")
+        return b"png"
+
+    monkeypatch.setattr(clock_server, "render_snapshot", render_snapshot)
+    state = ClockState(FixedTime(datetime(2024, 3, 5, 13, 37, tzinfo=timezone.utc)))
+    state.update()
+    cache = SnapshotCache()
+
+    async def fetch_twice():
+        with pytest.raises(ImportError):
+            await cache.get(state.snapshot, 100, state.themes.current)
+        return await cache.get(state.snapshot, 100, state.themes.current)
+
+    assert asyncio.run(fetch_twice()) == b"png"
+    assert len(calls) == 2
@@ -0,0 +1,60 @@
+import json
+import pytest
+from clock_themes import BUILTIN_THEMES, check_color, load_themes, read_theme_file
+
+COLORS = {"bg": "#000000", "primary": "#111111", "secondary": "#222222", "text": "#333333", "accent": "#444444"}
+
+
+@pytest.fixture(autouse=True)
+def no_theme_file_from_environment(monkeypatch):
+    monkeypatch.delenv("CLOCK_THEMES", raising=False)
+
+
+def write_json(tmp_path, data):
+    path = tmp_path / "themes.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+@pytest.mark.parametrize("color", ["#-12345", "#+1+2+3", "# 1 2 3", "#12345", "#1234567", "123456", 0x123456])
+def test_check_color_rejects_non_hex(color):
+    with pytest.raises(ValueError):
+        check_color("x", "bg", color)
+
+
+def test_check_color_normalizes_case():
+    assert check_color("x", "bg", "#abcdef") == "#ABCDEF"
+
+
+@pytest.mark.parametrize("data", [
+    "hello",
+    {"themes": {"Neon": COLORS}},
+    {"themes": ["Neon"]},
+    [{"name": 3, **COLORS}],
+    [{"name": "Missing", "bg": "#000000"}],
+])
+def test_malformed_theme_file_raises_value_error(tmp_path, data):
+    path = write_json(tmp_path, data)
+    with pytest.raises(ValueError, match="themes.json"):
+        read_theme_file(path)
+
+
+def test_user_theme_replaces_builtin_in_place(tmp_path):
+    name = BUILTIN_THEMES[1]["name"]
+    path = write_json(tmp_path, {"themes": [{"name": name.upper(), **COLORS}, {"name": "Paper", **COLORS}]})
+    registry = load_themes(path)
+    assert len(registry) == len(BUILTIN_THEMES) + 1
+    assert registry.themes[1].name == name.upper()
+    assert registry.themes[1].bg == COLORS["bg"]
+    assert registry.select("paper").name == "Paper"
+    assert registry.index == len(BUILTIN_THEMES)
+
+
+def test_next_wraps_around():
+    registry = load_themes(current=BUILTIN_THEMES[-1]["name"].lower())
+    assert registry.next().name == BUILTIN_THEMES[0]["name"]
+
+
+def test_unknown_theme_raises_value_error():
+    with pytest.raises(ValueError):
+        load_themes(current="No Such Theme")
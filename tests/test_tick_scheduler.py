@@ -0,0 +1,94 @@
+import types
+import pytest
+import tick_scheduler
+from tick_scheduler import BOUNDARY_MARGIN, TickScheduler
+
+
+class FakeClock:
+    """time.monotonic and time.time that only move when told to"""
+
+    def __init__(self, wall=1000.3):
+        self.mono = 50.0
+        self.offset = wall - self.mono
+
+    def monotonic(self):
+        return self.mono
+
+    def time(self):
+        return self.mono + self.offset
+
+
+class FakeWidget:
+    """Keeps the one pending after() callback for the test to run"""
+
+    def __init__(self):
+        self.pending = None
+
+    def after(self, delay, callback):
+        self.pending = (delay, callback)
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.pending = None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tick_scheduler, "time", types.SimpleNamespace(monotonic=clock.monotonic, time=clock.time))
+    return clock
+
+
+def start(clock, **options):
+    widget = FakeWidget()
+    calls = []
+    scheduler = TickScheduler(widget, lambda: calls.append(clock.time()), **options)
+    scheduler.start()
+    return scheduler, widget, calls
+
+
+def fire(clock, scheduler, widget, late=0.0):
+    """Run the pending tick at its deadline plus late seconds"""
+    clock.mono = scheduler._deadline + BOUNDARY_MARGIN + late
+    _, callback = widget.pending
+    widget.pending = None
+    callback()
+
+
+def test_ticks_land_on_wall_boundaries(clock):
+    scheduler, widget, calls = start(clock)
+    fire(clock, scheduler, widget)
+    fire(clock, scheduler, widget)
+    assert [round(wall - BOUNDARY_MARGIN, 6) for wall in calls] == [1001.0, 1002.0]
+    assert scheduler.stats()["dropped"] == 0
+
+
+def test_drop_policy_skips_missed_ticks(clock):
+    scheduler, widget, calls = start(clock)
+    fire(clock, scheduler, widget, late=3.5)
+    assert len(calls) == 1
+    assert scheduler.dropped == 3
+    assert scheduler.caught_up == 0
+    # Back on the boundary after the stall
+    assert scheduler._deadline + clock.offset == pytest.approx(1005.0)
+
+
+def test_catch_up_policy_replays_up_to_the_limit(clock):
+    scheduler, widget, calls = start(clock, policy="catch_up", max_catch_up=2)
+    fire(clock, scheduler, widget, late=4.5)
+    assert len(calls) == 3
+    assert scheduler.caught_up == 2
+    assert scheduler.dropped == 2
+    assert scheduler._deadline + clock.offset == pytest.approx(1006.0)
+
+
+def test_wall_clock_jump_realigns(clock):
+    scheduler, widget, calls = start(clock)
+    fire(clock, scheduler, widget)
+    # The wall clock is set 10.4 s ahead between ticks
+    clock.offset += 10.4
+    fire(clock, scheduler, widget)
+    next_wall = scheduler._deadline + clock.offset
+    assert next_wall == pytest.approx(round(next_wall))
+    assert next_wall > clock.time()
+    assert scheduler.dropped == 0
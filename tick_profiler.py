@@ -0,0 +1,176 @@
+"""Opt-in per-phase timing of the clock tick loop"""
+import json
+import os
+import time
+import tkinter as tk
+
+# Ticks kept for percentiles; older samples are overwritten
+RING_SIZE = 1024
+# Seconds between report file writes and overlay refreshes
+REPORT_INTERVAL = 10.0
+OVERLAY_INTERVAL = 1.0
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every hook is a no-op"""
+
+    enabled = False
+
+    def begin_tick(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_tick(self):
+        pass
+
+
+class TickProfiler:
+    """Ring buffers of per-phase tick timings with late-tick counting
+
+    update_clock calls begin_tick(), then mark(phase) after each phase and
+    end_tick() at the end. The Tk redraw that follows is timed with an idle
+    callback and recorded as the "redraw" phase. A tick is late when it
+    takes longer than the scheduler's frame interval at that moment.
+    """
+
+    enabled = True
+
+    def __init__(self, widget, scheduler, output=None, overlay=False, ring_size=RING_SIZE):
+        self.widget = widget
+        self.scheduler = scheduler
+        self.output = output
+        self.ring_size = ring_size
+        self.phases = {}
+        self.frame_times = [0.0] * ring_size
+        self.index = 0
+        self.samples = 0
+        self.ticks = 0
+        self.late_ticks = 0
+        self._tick_start = 0.0
+        self._last_mark = 0.0
+        self._last_report = time.perf_counter()
+        self._last_overlay = 0.0
+        self.overlay = None
+        if overlay:
+            self.overlay = tk.Label(widget, font=("Courier", 9), fg="#E0E0E0", bg="#000000", justify=tk.LEFT)
+            self.overlay.place(x=0, y=0)
+
+    @property
+    def budget(self):
+        # Follows FramePacer and PowerSaver as they change the tick rate
+        return self.scheduler.frame_interval
+
+    def begin_tick(self):
+        self._tick_start = self._last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self._record(phase, now - self._last_mark)
+        self._last_mark = now
+
+    def end_tick(self):
+        self.widget.after_idle(self._end_redraw)
+
+    def _record(self, phase, seconds):
+        ring = self.phases.get(phase)
+        if ring is None:
+            ring = self.phases[phase] = [0.0] * self.ring_size
+        ring[self.index] = seconds
+
+    def _end_redraw(self):
+        now = time.perf_counter()
+        self._record("redraw", now - self._last_mark)
+        frame_time = now - self._tick_start
+        self.frame_times[self.index] = frame_time
+        self.index = (self.index + 1) % self.ring_size
+        self.samples = min(self.samples + 1, self.ring_size)
+        self.ticks += 1
+        if frame_time > self.budget:
+            self.late_ticks += 1
+
+        if self.overlay is not None and now - self._last_overlay >= OVERLAY_INTERVAL:
+            self._last_overlay = now
+            self._update_overlay()
+        if self.output and now - self._last_report >= REPORT_INTERVAL:
+            self._last_report = now
+            self.write_report(self.output)
+
+    def summary(self):
+        """p50/p95/p99 frame and phase times in milliseconds, tick counts and scheduler jitter"""
+        def stats(ring):
+            values = sorted(ring[:self.samples])
+            return {
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+
+        return {
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "budget_ms": self.budget * 1000,
+            "frame": stats(self.frame_times),
+            "phases": {phase: stats(ring) for phase, ring in self.phases.items()},
+            "scheduler": self.scheduler.stats(),
+        }
+
+    def write_report(self, path):
+        """Write the summary as JSON, or Prometheus text for a .prom path"""
+        summary = self.summary()
+        scheduler = summary["scheduler"]
+        if path.endswith(".prom"):
+            lines = [
+                f"clock_ticks_total {summary['ticks']}",
+                f"clock_late_ticks_total {summary['late_ticks']}",
+                f"clock_dropped_ticks_total {scheduler['dropped']}",
+                f"clock_caught_up_ticks_total {scheduler['caught_up']}",
+                f'clock_tick_jitter_seconds{{stat="mean"}} {scheduler["jitter_mean_ms"] / 1000:.6f}',
+                f'clock_tick_jitter_seconds{{stat="max"}} {scheduler["jitter_max_ms"] / 1000:.6f}',
+            ]
+            for quantile in ("p50", "p95", "p99"):
+                q = int(quantile[1:]) / 100
+                lines.append(f'clock_frame_seconds{{quantile="{q}"}} {summary["frame"][quantile + "_ms"] / 1000:.6f}')
+                for phase, stats in summary["phases"].items():
+                    lines.append(
+                        f'clock_phase_seconds{{phase="{phase}",quantile="{q}"}} {stats[quantile + "_ms"] / 1000:.6f}'
+                    )
+            text = "\n".join(lines) + "\n"
+        else:
+            text = json.dumps(summary, indent=2)
+        # Write then rename so scrapers never read a half-written file
+        temporary = path + ".tmp"
+        with open(temporary, "w") as handle:
+            handle.write(text)
+        os.replace(temporary, path)
+
+    def _update_overlay(self):
+        summary = self.summary()
+        frame = summary["frame"]
+        lines = [f"frame p50 {frame['p50_ms']:.1f} p95 {frame['p95_ms']:.1f} p99 {frame['p99_ms']:.1f} ms"]
+        for phase, stats in summary["phases"].items():
+            lines.append(f"{phase:<8} p50 {stats['p50_ms']:.1f} p99 {stats['p99_ms']:.1f} ms")
+        lines.append(f"late {summary['late_ticks']}/{summary['ticks']}")
+        scheduler = summary["scheduler"]
+        lines.append(
+            f"jitter mean {scheduler['jitter_mean_ms']:.1f} max {scheduler['jitter_max_ms']:.1f} ms"
+            f" dropped {scheduler['dropped']} caught up {scheduler['caught_up']}"
+        )
+        self.overlay.configure(text="\n".join(lines))
+
+
+def create_profiler(widget, scheduler, output=None, overlay=False):
+    """Profiler from CLI options, falling back to CLOCK_PROFILE / CLOCK_PROFILE_OVERLAY"""
+    output = output or os.environ.get("CLOCK_PROFILE")
+    overlay = overlay or os.environ.get("CLOCK_PROFILE_OVERLAY", "") not in ("", "0")
+    if not output and not overlay:
+        return NullProfiler()
+    return TickProfiler(widget, scheduler, output, overlay)
@@ -0,0 +1,179 @@
+"""Drift-free tick scheduling aligned to wall-clock second boundaries"""
+import math
+import time
+
+# Fire slightly after the boundary so the callback never reads the previous second
+BOUNDARY_MARGIN = 0.002
+# Tick periods: one per second, or one per pulse animation frame
+SECOND_INTERVAL = 1.0
+ANIMATION_FRAME_INTERVAL = 0.2
+# Realign when the wall clock moves against the monotonic clock (NTP, manual change)
+RESYNC_THRESHOLD = 0.05
+# Frame rates for smooth animation, best first; the pacer steps down when frames overrun
+SWEEP_FRAME_RATES = (60, 30, 15)
+# Fraction of a frame the measured render cost may use before stepping down
+PACER_HEADROOM = 0.75
+# Frames measured between frame rate decisions
+PACER_WINDOW = 30
+
+
+class TickScheduler:
+    """Runs a Tk callback on every second boundary, or every animation frame
+
+    Deadlines live on the monotonic clock, so ticks do not accumulate drift.
+    After a stall the scheduler either drops the missed frames and resumes on
+    the next boundary ("drop") or replays up to max_catch_up of them back to
+    back before dropping the rest ("catch_up").
+    """
+
+    def __init__(self, widget, callback, frame_interval=SECOND_INTERVAL, policy="drop", max_catch_up=5):
+        if policy not in ("drop", "catch_up"):
+            raise ValueError(f"Unknown stall policy: {policy}")
+        self.widget = widget
+        self.callback = callback
+        self.frame_interval = frame_interval
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self._after_id = None
+        self._running = False
+        self._deadline = None
+        self._wall_offset = 0.0
+        self.reset_stats()
+
+    def start(self):
+        """Begin ticking on the next frame boundary"""
+        self.stop()
+        self._running = True
+        self._align()
+        self._schedule()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def set_frame_interval(self, frame_interval):
+        """Switch between per-second and per-frame ticking"""
+        self.frame_interval = frame_interval
+        if self._running:
+            self.start()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.dropped = 0
+        self.caught_up = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.jitter_last = 0.0
+
+    def stats(self):
+        """Lateness of ticks against their deadlines, in milliseconds"""
+        return {
+            "ticks": self.ticks,
+            "dropped": self.dropped,
+            "caught_up": self.caught_up,
+            "jitter_mean_ms": self.jitter_total / self.ticks * 1000 if self.ticks else 0.0,
+            "jitter_max_ms": self.jitter_max * 1000,
+            "jitter_last_ms": self.jitter_last * 1000,
+        }
+
+    def _align(self):
+        # Map the next wall-clock frame boundary onto the monotonic clock
+        mono = time.monotonic()
+        wall = time.time()
+        self._wall_offset = wall - mono
+        next_wall = (math.floor(wall / self.frame_interval) + 1) * self.frame_interval
+        self._deadline = next_wall - self._wall_offset
+
+    def _schedule(self):
+        delay = self._deadline + BOUNDARY_MARGIN - time.monotonic()
+        self._after_id = self.widget.after(max(1, math.ceil(delay * 1000)), self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        now = time.monotonic()
+        lateness = now - self._deadline
+        self.ticks += 1
+        self.jitter_last = lateness
+        self.jitter_total += lateness
+        self.jitter_max = max(self.jitter_max, lateness)
+
+        missed = int(lateness // self.frame_interval)
+        if missed > 0 and self.policy == "catch_up":
+            replay = min(missed, self.max_catch_up)
+            for _ in range(replay):
+                self.callback()
+            self.caught_up += replay
+            self.dropped += missed - replay
+        else:
+            self.dropped += missed
+
+        self.callback()
+        if not self._running or self._after_id is not None:
+            # The callback stopped or restarted the scheduler
+            return
+
+        if abs((time.time() - time.monotonic()) - self._wall_offset) > RESYNC_THRESHOLD:
+            self._align()
+        else:
+            self._deadline += (missed + 1) * self.frame_interval
+            # The callback itself may have overrun the next deadline
+            while self._deadline <= time.monotonic():
+                self._deadline += self.frame_interval
+                self.dropped += 1
+        self._schedule()
+
+
+class FramePacer:
+    """Measures the render cost of each frame and picks the highest frame rate that fits
+
+    Call begin_frame() at the start of the tick callback and end_frame() at its
+    end; the cost includes the Tk redraw, timed with an idle callback. Every
+    window frames the smoothed cost is compared with the frame budget: above
+    the headroom the rate drops a step (60, 30, 15 fps), and when it would fit
+    well inside the next faster rate it climbs back. The target is anything
+    with set_frame_interval(), such as a TickScheduler.
+    """
+
+    def __init__(self, widget, target, rates=SWEEP_FRAME_RATES, headroom=PACER_HEADROOM, window=PACER_WINDOW):
+        self.widget = widget
+        self.target = target
+        self.rates = rates
+        self.headroom = headroom
+        self.window = window
+        self.level = 0
+        self.cost = 0.0
+        self.frames = 0
+        self._frame_start = 0.0
+        target.set_frame_interval(self.frame_interval)
+
+    @property
+    def rate(self):
+        return self.rates[self.level]
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.rates[self.level]
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        self.widget.after_idle(self._end_redraw)
+
+    def _end_redraw(self):
+        cost = time.perf_counter() - self._frame_start
+        # Exponential moving average, so one slow frame does not change the rate
+        self.cost += (cost - self.cost) * 0.1
+        self.frames += 1
+        if self.frames < self.window:
+            return
+        self.frames = 0
+        if self.cost > self.frame_interval * self.headroom and self.level < len(self.rates) - 1:
+            self.level += 1
+        elif self.level > 0 and self.cost < self.headroom / self.rates[self.level - 1] / 2:
+            self.level -= 1
+        else:
+            return
+        self.target.set_frame_interval(self.frame_interval)